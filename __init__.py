@@ -1,26 +1,45 @@
+import importlib
 
-## Selenium Imports ##
-try:
-    from selenium import webdriver
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.common.keys import Keys    
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    import webdriver_manager
-except Exception as e:
-    print(f'[PySBK::Selenium] Import error: {e}')
-    
-## PySBK Imports ##    
-try:
-    from PySBK import __about__ as about
-    from PySBK.sebrowser import SeleniumBrowser
-    from PySBK.sbk import PySBK
-except Exception as e:
-    print(f'[PySBK] Import Error: {e}')
+## Lazy Imports ##
+# Selenium, webdriver_manager and the PySBK modules load on first attribute access
+_lazy = {
+    # Selenium
+    "By": ("selenium.webdriver.common.by", "By"),
+    "EC": ("selenium.webdriver.support.expected_conditions", None),
+    "Keys": ("selenium.webdriver.common.keys", "Keys"),
+    "WebDriverWait": ("selenium.webdriver.support.ui", "WebDriverWait"),
+    "webdriver": ("selenium.webdriver", None),
+    # PySBK
+    "AsyncPySBK": ("PySBK.aio", "AsyncPySBK"),
+    "Condition": ("PySBK.waits", "Condition"),
+    "DriverPool": ("PySBK.pool", "DriverPool"),
+    "JobRunner": ("PySBK.runner", "JobRunner"),
+    "Plan": ("PySBK.plans", "Plan"),
+    "Profiler": ("PySBK.profiling", "Profiler"),
+    "PySBK": ("PySBK.sbk", "PySBK"),
+    "Recorder": ("PySBK.plans", "Recorder"),
+    "SeleniumBrowser": ("PySBK.sebrowser", "SeleniumBrowser"),
+}
+
+def __getattr__(name):
+    if name not in _lazy:
+        raise AttributeError(f"module 'PySBK' has no attribute '{name}'")
+    module, attr = _lazy[name]
+    value = importlib.import_module(module)
+    if attr:
+        value = getattr(value, attr)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy))
+
+## PySBK Imports ##
+from PySBK import __about__ as about
 
 ## Wildcard Importing ##    
 __selenium__ = ["By", "EC", "Keys", "WebDriverWait"]
-__PySBK__ = ["about", "PySBK", "SeleniumBrowser"]
+__PySBK__ = ["about", "AsyncPySBK", "Condition", "DriverPool", "JobRunner", "Plan", "Profiler", "PySBK", "Recorder", "SeleniumBrowser"]
 __all__ = __PySBK__ + __selenium__
 
 ## Package Metadata ##
@@ -29,6 +48,3 @@ __version__ = about.version
 __author__ = about.author
 __license__ = about.license
 __homepage__ = about.homepage
-
-
-
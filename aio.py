@@ -0,0 +1,82 @@
+import asyncio, threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .sbk import PySBK
+
+
+# Asyncio front-end, blocking PySBK calls run on a bounded executor owned by this browser
+class AsyncPySBK:
+    def __init__(self, bot=None, max_workers=1, **kwargs):
+        self.bot = bot or PySBK(**kwargs)
+        # A WebDriver session is not thread-safe, so one worker per browser is the default
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="PySBK")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def call(self, name, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, partial(getattr(self.bot, name), *args, **kwargs))
+
+    async def close(self, stop=False):
+        if stop and self.bot.leased:
+            await self.call("release")
+        elif stop:
+            await self.call("stop_browser", self.bot.browser)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    # Awaitable actions
+    async def launch_browser(self, name, mode="selenium"):
+        return await self.call("launch_browser", name, mode)
+
+    async def go(self, url, **kwargs):
+        return await self.call("go", url, **kwargs)
+
+    async def find(self, by, match, which="only", label=None):
+        return await self.call("find", by, match, which, label)
+
+    async def find_many(self, specs):
+        return await self.call("find_many", specs)
+
+    async def click(self, target=None, behavior="default", **kwargs):
+        return await self.call("click", target, behavior, **kwargs)
+
+    async def type(self, text, target=None, mode="default", term="", **kwargs):
+        return await self.call("type", text, target, mode, term, **kwargs)
+
+    async def expect(self, by, match, condition="present", value=False, mode="partial"):
+        return await self.call("expect", by, match, condition, value, mode)
+
+    async def get_text(self, target=None, **kwargs):
+        return await self.call("get_text", target, **kwargs)
+
+    async def get_attribute(self, attr, target=None, **kwargs):
+        return await self.call("get_attribute", attr, target, **kwargs)
+
+    async def extract(self, target, fields=("text",)):
+        return await self.call("extract", target, fields)
+
+    # Waits, cancelling the awaiting task stops the pending wait in its worker thread
+    async def wait(self, condition, timeout=None, backend=None):
+        return await self.cancellable("wait", condition, timeout, backend)
+
+    async def wait_for(self, by, match, condition="present", value=False, mode="partial", timeout=None, backend=None):
+        return await self.cancellable("wait_for", by, match, condition, value, mode, timeout, backend)
+
+    async def wait_any(self, *conditions, timeout=None, backend=None):
+        return await self.cancellable("wait_any", *conditions, timeout=timeout, backend=backend)
+
+    async def wait_all(self, *conditions, timeout=None, backend=None):
+        return await self.cancellable("wait_all", *conditions, timeout=timeout, backend=backend)
+
+    async def cancellable(self, name, *args, **kwargs):
+        cancel = threading.Event()
+        try:
+            return await self.call(name, *args, cancel=cancel, **kwargs)
+        except asyncio.CancelledError:
+            cancel.set()
+            raise
@@ -0,0 +1,17 @@
+import importlib.util, sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+#   Makes the checkout importable as the PySBK package whatever its directory is named
+def load_package():
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))  # flat imports (runtime, sebrowser, ...)
+    if "PySBK" not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            "PySBK", ROOT / "__init__.py", submodule_search_locations=[str(ROOT)]
+        )
+        package = importlib.util.module_from_spec(spec)
+        sys.modules["PySBK"] = package
+        spec.loader.exec_module(package)
+    return sys.modules["PySBK"]
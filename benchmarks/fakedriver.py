@@ -0,0 +1,291 @@
+import re, urllib.request
+from html.parser import HTMLParser
+
+from benchmarks import load_package
+
+load_package()
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from PySBK.sbk import EXTRACT_JS, FIND_CACHED_JS, FIND_MANY_JS, NAV_SETTLE_JS
+from PySBK.plans import REPLAY_JS
+from PySBK.sebrowser import DRAIN_EVENTS_JS
+from PySBK.waits import OBSERVE_JS
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+
+# In-process stand-in for a WebDriver session, every command counts as one round trip
+class FakeExecutor:
+    def __init__(self):
+        self.round_trips = 0
+
+    def execute(self, command, params=None):
+        self.round_trips += 1
+        return None
+
+
+class FakeTimeouts:
+    def __init__(self, script):
+        self.script = script
+
+
+class FakeElement:
+    def __init__(self, driver, tag, attrs, parent=None):
+        self.driver = driver
+        self.tag_name = tag
+        self.attrs = dict(attrs)
+        self.parent = parent
+        self.children = []
+        self.chunks = []
+        self.value = self.attrs.get("value", "")
+        self.clicks = 0
+
+    def __repr__(self):
+        return f"<FakeElement {self.tag_name} id={self.attrs.get('id')}>"
+
+    def iter(self):
+        for child in self.children:
+            yield child
+            yield from child.iter()
+
+    # Elements of a replaced document go stale, like handles after a navigation or re-render
+    def command(self, name, result=None):
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        if node is not self.driver.document:
+            self.driver.command(name)
+            raise StaleElementReferenceException(f"{self!r} is no longer attached")
+        return self.driver.command(name, result)
+
+    @property
+    def text(self):
+        return self.command("getElementText", self._text())
+
+    def _text(self):
+        return " ".join(filter(None, [c.strip() for c in self.chunks] + [c._text() for c in self.children])).strip()
+
+    def get_attribute(self, name):
+        return self.command("getElementAttribute", self._attribute(name))
+
+    def _attribute(self, name):
+        return self.value if name == "value" else self.attrs.get(name)
+
+    def click(self):
+        self.command("clickElement")
+        self.clicks += 1
+
+    def send_keys(self, text):
+        self.command("sendKeysToElement")
+        self.value += text
+
+    def clear(self):
+        self.command("clearElement")
+        self.value = ""
+
+    def is_displayed(self):
+        return self.command("isElementDisplayed", True)
+
+    def is_enabled(self):
+        return self.command("isElementEnabled", "disabled" not in self.attrs)
+
+
+class DocumentParser(HTMLParser):
+    def __init__(self, driver):
+        super().__init__()
+        self.root = FakeElement(driver, "#document", {})
+        self.current = self.root
+
+    def handle_starttag(self, tag, attrs):
+        el = FakeElement(self.root.driver, tag, attrs, self.current)
+        self.current.children.append(el)
+        if tag not in VOID_TAGS:
+            self.current = el
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not self.root and node.tag_name != tag:
+            node = node.parent
+        if node is not self.root:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        self.current.chunks.append(data)
+
+
+# Compound CSS selectors with descendant combinators, plus //tag[@attr='value'] XPath
+COMPOUND = re.compile(r"([a-zA-Z0-9*-]+)?((?:#[\w-]+|\.[\w-]+|\[[\w-]+(?:=[\"']?[^\]\"']*[\"']?)?\])*)")
+PART = re.compile(r"#([\w-]+)|\.([\w-]+)|\[([\w-]+)(?:=[\"']?([^\]\"']*)[\"']?)?\]")
+XPATH = re.compile(r"^//([\w*]+)(?:\[@([\w-]+)=[\"']([^\"']*)[\"']\])?$")
+
+def compile_compound(text):
+    tag, rest = COMPOUND.fullmatch(text).groups()
+    checks = []
+    if tag and tag != "*":
+        checks.append(lambda el, tag=tag.lower(): el.tag_name == tag)
+    for ident, cls, attr, value in PART.findall(rest or ""):
+        if ident:
+            checks.append(lambda el, v=ident: el.attrs.get("id") == v)
+        elif cls:
+            checks.append(lambda el, v=cls: v in (el.attrs.get("class") or "").split())
+        elif value:
+            checks.append(lambda el, a=attr, v=value: el.attrs.get(a) == v)
+        else:
+            checks.append(lambda el, a=attr: a in el.attrs)
+    return lambda el: all(check(el) for check in checks)
+
+def matches(el, compounds):
+    if not compounds[-1](el):
+        return False
+    remaining, node = compounds[:-1], el.parent
+    while remaining and node is not None:
+        if remaining[-1](node):
+            remaining = remaining[:-1]
+        node = node.parent
+    return not remaining
+
+
+class FakeDriver:
+    def __init__(self):
+        self.command_executor = FakeExecutor()
+        self.session_id = "fake-session"
+        self.document = DocumentParser(self).root
+        self.url = "about:blank"
+        self.gen = 0  # DOM generation as the _PySBK agent would report it
+        self.script_timeout = 30.0
+
+    # Every public call funnels through here so instrumentation sees one command each
+    def command(self, name, result=None):
+        self.command_executor.execute(name, {})
+        return result
+
+    @property
+    def round_trips(self):
+        return self.command_executor.round_trips
+
+    @property
+    def current_url(self):
+        return self.command("getCurrentUrl", self.url)
+
+    def get(self, url):
+        self.command("get")
+        with urllib.request.urlopen(url) as response:
+            html = response.read().decode()
+        parser = DocumentParser(self)
+        parser.feed(html)
+        self.document, self.url = parser.root, url
+        self.gen = 0
+
+    def set_script_timeout(self, seconds):
+        self.command("setTimeouts")
+        self.script_timeout = seconds
+
+    @property
+    def timeouts(self):
+        return self.command("getTimeouts", FakeTimeouts(self.script_timeout))
+
+    def quit(self):
+        self.command("quit")
+
+    # Element lookup
+    def locate(self, by, match):
+        if by == "xpath":
+            parsed = XPATH.match(match)
+            if not parsed:
+                return []
+            tag, attr, value = parsed.groups()
+            return [
+                el for el in self.document.iter()
+                if (tag == "*" or el.tag_name == tag) and (not attr or el.attrs.get(attr) == value)
+            ]
+        if by == "id":
+            match = f"[id={match}]"
+        elif by == "name":
+            match = f"[name={match}]"
+        elif by == "class name":
+            match = f".{match}"
+        elif by == "tag name":
+            match = match.lower()
+        elif by != "css selector":
+            return []
+        groups = [[compile_compound(part) for part in group.split()] for group in match.split(",")]
+        return [el for el in self.document.iter() if any(matches(el, g) for g in groups)]
+
+    def find_elements(self, by, match):
+        return self.command("findElements", self.locate(by, match))
+
+    def find_element(self, by, match):
+        elements = self.find_elements(by, match)
+        if not elements:
+            raise NoSuchElementException(f"{by}={match}")
+        return elements[0]
+
+    # Script emulation, keyed on the scripts PySBK actually sends
+    def execute_script(self, script, *args):
+        self.command("executeScript")
+        if script == FIND_MANY_JS:
+            return [self.locate(by, match) for by, match in args[0]]
+        if script == FIND_CACHED_JS:
+            by, match, url, gen, batch = args
+            if gen == self.gen and url == self.url:
+                return [self.url, self.gen, None]
+            return [self.url, self.gen, self.locate(by, match) if batch else None]
+        if script == EXTRACT_JS:
+            elements, fields = args
+            return {f: [self.field(el, f) for el in elements] for f in fields}
+        if script == REPLAY_JS:
+            return self.replay(args[0])
+        if script == DRAIN_EVENTS_JS:
+            return {"epoch": "fake", "cursor": 0, "dropped": 0, "entries": []}
+        return None
+
+    def execute_async_script(self, script, *args):
+        self.command("executeAsyncScript")
+        if script == NAV_SETTLE_JS:
+            return {"ready_state": "complete", "url": self.url, "page_time": 0.0,
+                    "bytes": 0, "requests": 1, "cached": 0, "unmeasured": 0}
+        if script == OBSERVE_JS:
+            specs, mode = args[0], args[1]
+            hits = [self.check(*spec) for spec in specs]
+            if mode == "any":
+                index = next((i for i, hit in enumerate(hits) if hit is not None), None)
+                return {"index": index, "hits": hits} if index is not None else None
+            return {"index": -1, "hits": hits} if all(hit is not None for hit in hits) else None
+        return None
+
+    def replay(self, steps):
+        for i, step in enumerate(steps):
+            found = self.locate(step["by"], step["match"])
+            which = step["which"] if isinstance(step["which"], int) else 0
+            if which >= len(found):
+                return [i, f"No elements found for {step['by']}={step['match']}"]
+            el = found[which]
+            if step["op"] == "click":
+                el.clicks += 2 if step["behavior"] == "double" else 1
+            else:
+                el.value = (el.value if step["mode"] != "clear_then_type" else "") + step["text"]
+        return [len(steps), None]
+
+    def field(self, el, name):
+        if name == "text":
+            return el._text()
+        if name == "tag":
+            return el.tag_name
+        if name == "rect":
+            return {"x": 0, "y": 0, "width": 0, "height": 0}
+        return el._attribute(name)
+
+    def check(self, by, match, key, value):
+        found = self.locate(by, match)
+        if not found:
+            return None
+        el = found[0]
+        if key in ("present", "visible"):
+            return el
+        text = el._text()
+        return True if {
+            "value": lambda: str(value) in el.value,
+            "text_exact": lambda: text == value,
+            "text_partial": lambda: value in text,
+            "text_lower": lambda: str(value).lower() in text.lower(),
+            "text_regex": lambda: re.search(value, text) is not None,
+        }.get(key, lambda: False)() else None
@@ -0,0 +1,56 @@
+import argparse, json, statistics, subprocess, sys
+
+from benchmarks import ROOT
+
+#   Import time targets in seconds, each measured in a fresh interpreter
+TARGETS = {
+    "import PySBK": 0.05,
+    "load_strategies": 0.10,
+}
+
+SNIPPETS = {
+    "import PySBK": "from benchmarks import load_package; load_package()",
+    "load_strategies": "from benchmarks import load_package; load_package(); from PySBK import runtime; runtime.load_strategies()",
+}
+
+PROBE = """
+import time
+start = time.perf_counter()
+{snippet}
+print(time.perf_counter() - start)
+"""
+
+
+def measure(snippet, runs=5):
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(snippet=snippet)],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PySBK import time targets")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args(argv)
+
+    results, failed = {}, False
+    for name, snippet in SNIPPETS.items():
+        elapsed = measure(snippet, args.runs)
+        ok = elapsed <= TARGETS[name]
+        failed |= not ok
+        results[name] = {"seconds": elapsed, "target": TARGETS[name], "ok": ok}
+        print(f"{name:<18} {elapsed * 1e3:>8.1f} ms  target {TARGETS[name] * 1e3:.0f} ms  {'ok' if ok else 'SLOW'}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
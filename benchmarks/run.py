@@ -0,0 +1,165 @@
+import argparse, json, logging, sys, time
+from pathlib import Path
+
+from benchmarks import load_package
+from benchmarks.server import FixtureServer
+
+load_package()
+from PySBK import runtime
+from selenium.webdriver.common.by import By
+from PySBK.cache import FindCache
+from PySBK.plans import Plan
+from PySBK.profiling import Profiler
+from PySBK.sbk import PySBK
+
+BASELINES = Path(__file__).parent / "baselines.json"
+
+#   Benchmark cases: (name, fixture page or None, factory returning the operation)
+CASES = [
+    ("find", "/form.html", lambda bot, srv: lambda: bot.find(By.ID, "field7")),
+    ("find_many", "/form.html", lambda bot, srv: lambda: bot.find_many(
+        [(By.NAME, f"field{i}") for i in range(30)]
+    )),
+    ("resolve", "/form.html", lambda bot, srv: lambda: bot.resolve(by=By.NAME, match="field3")),
+    ("click", "/form.html", lambda bot, srv: lambda: bot.click(by=By.ID, match="submit")),
+    ("type", "/form.html", lambda bot, srv: lambda: bot.type("x", by=By.ID, match="field1")),
+    ("expect", "/form.html", lambda bot, srv: lambda: bot.isText("Ready", by=By.ID, match="banner")),
+    ("wait_poll", "/form.html", lambda bot, srv: lambda: bot.wait_for(By.ID, "banner", "visible", backend="poll")),
+    ("wait_observer", "/form.html", lambda bot, srv: lambda: bot.wait_for(By.ID, "banner", "visible", backend="observer")),
+    ("extract", "/listing.html", lambda bot, srv: lambda: bot.extract(
+        bot.find(By.CSS_SELECTOR, "tr.row", which="all"), ["text", "data-id"]
+    )),
+    ("form_steps", "/form.html", lambda bot, srv: lambda: fill_form(bot)),
+    ("form_plan", "/form.html", lambda bot, srv: lambda: FORM_PLAN.replay(bot)),
+    ("go", None, lambda bot, srv: lambda: bot.go(srv.url("/form.html"))),
+    ("load_strategies", None, lambda bot, srv: lambda: runtime.load_strategies()),
+    # Runs last since it leaves the find cache enabled
+    ("find_cached", "/form.html", lambda bot, srv: enable_find_cache(bot) or (lambda: bot.find(By.ID, "field7"))),
+]
+
+
+# Fills ten fields and submits, step by step and as a compiled plan
+FORM_PLAN = Plan(
+    [{"op": "type", "by": By.ID, "match": f"field{i}", "which": "only", "mode": "clear_then_type", "text": "x", "term": ""}
+     for i in range(10)]
+    + [{"op": "click", "by": By.ID, "match": "submit", "which": "only", "behavior": "default"}],
+    name="form",
+)
+
+
+def fill_form(bot):
+    for i in range(10):
+        bot.type("x", mode="clear_then_type", by=By.ID, match=f"field{i}")
+    bot.click(by=By.ID, match="submit")
+
+
+def enable_find_cache(bot):
+    bot.find_cache = FindCache()
+
+
+def make_bot(backend, profiler):
+    bot = PySBK(detect="lazy", headless="true", profiler=profiler)
+    bot.log.setLevel(logging.CRITICAL)
+    if backend == "fake":
+        from benchmarks.fakedriver import FakeDriver
+        bot.driver = profiler.instrument_driver(FakeDriver())
+    else:
+        bot.launch_browser(backend, mode="headless")
+        if not bot.driver:
+            raise SystemExit(f"Could not launch {backend}: {bot.last_error}")
+    return bot
+
+
+def measure(op, profiler, iterations, warmup):
+    for _ in range(warmup):
+        op()
+    before = profiler.totals()["round_trips"]
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        op()
+        latencies.append(time.perf_counter() - start)
+    round_trips = profiler.totals()["round_trips"] - before
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        "ops_per_sec": iterations / total if total else float("inf"),
+        "p50": latencies[int(0.50 * (iterations - 1))],
+        "p99": latencies[int(0.99 * (iterations - 1))],
+        "round_trips": round_trips / iterations,
+    }
+
+
+def run(backend="fake", iterations=200, warmup=10, only=None):
+    profiler = Profiler()
+    bot = make_bot(backend, profiler)
+    results = {}
+    try:
+        with FixtureServer() as srv:
+            for name, page, factory in CASES:
+                if only and name not in only:
+                    continue
+                if page:
+                    bot.go(srv.url(page), reinject=False)
+                results[name] = measure(factory(bot, srv), profiler, iterations, warmup)
+    finally:
+        if backend != "fake" and bot.driver:
+            bot.driver.quit()
+    return results
+
+
+#   Baselines are stored per backend, regressions are slower p50 or extra round trips
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, current in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if current["round_trips"] > base["round_trips"]:
+            regressions.append(f"{name}: round trips {base['round_trips']:.2f} -> {current['round_trips']:.2f}")
+        if current["p50"] > base["p50"] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {base['p50'] * 1e3:.3f}ms -> {current['p50'] * 1e3:.3f}ms")
+    return regressions
+
+
+def report(results):
+    print(f"{'case':<16} {'ops/sec':>10} {'p50 ms':>9} {'p99 ms':>9} {'trips/op':>9}")
+    for name, r in results.items():
+        print(f"{name:<16} {r['ops_per_sec']:>10.1f} {r['p50'] * 1e3:>9.3f} {r['p99'] * 1e3:>9.3f} {r['round_trips']:>9.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="PySBK hot path benchmarks")
+    parser.add_argument("--backend", default="fake", help="fake, or a browser name such as chromium")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--only", nargs="*", help="case names to run")
+    parser.add_argument("--json", help="write results to this file")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="exit non-zero on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown ratio")
+    args = parser.parse_args(argv)
+
+    results = run(args.backend, args.iterations, args.warmup, args.only)
+    report(results)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    if args.save_baseline:
+        baselines.setdefault(args.backend, {}).update(results)
+        BASELINES.write_text(json.dumps(baselines, indent=2, sort_keys=True))
+        print(f"Saved baseline for {args.backend} to {BASELINES}")
+
+    if args.compare:
+        regressions = compare(results, baselines.get(args.backend, {}), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
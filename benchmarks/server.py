@@ -0,0 +1,81 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+#   Fixture pages, generated so row counts can be tuned without checking in large files
+def form_page(fields=30):
+    inputs = "\n".join(
+        f'<label for="field{i}">Field {i}</label><input id="field{i}" name="field{i}" class="field" type="text">'
+        for i in range(fields)
+    )
+    return f"""<!doctype html>
+<html><head><title>form</title></head>
+<body>
+<form id="form">
+{inputs}
+<button id="submit" class="btn primary" type="button">Submit</button>
+</form>
+<div class="banner" id="banner">Ready</div>
+</body></html>"""
+
+def listing_page(rows=500):
+    items = "\n".join(
+        f'<tr class="row" data-id="{i}"><td class="name">Item {i}</td>'
+        f'<td><a class="link" href="/item/{i}">open</a></td></tr>'
+        for i in range(rows)
+    )
+    return f"""<!doctype html>
+<html><head><title>listing</title></head>
+<body><table id="listing">
+{items}
+</table></body></html>"""
+
+def redirect_page(target="/form.html"):
+    return f"""<!doctype html>
+<html><head><title>redirect</title></head>
+<body><script>location.replace("{target}");</script></body></html>"""
+
+PAGES = {
+    "/form.html": form_page,
+    "/listing.html": listing_page,
+    "/redirect.html": redirect_page,
+}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        page = PAGES.get(self.path.split("?", 1)[0])
+        if not page:
+            self.send_error(404)
+            return
+        body = page().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+#   Serves the fixture pages on localhost from a daemon thread
+class FixtureServer:
+    def __init__(self, host="127.0.0.1", port=0):
+        self.httpd = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path):
+        return self.base_url + path
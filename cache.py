@@ -0,0 +1,146 @@
+import sys, time
+from collections import OrderedDict
+
+
+# find() result cache, valid for one URL and DOM generation of the _PySBK agent
+class FindCache:
+    def __init__(self, size=256):
+        self.size = size
+        self.entries = OrderedDict()  # (by, match) -> elements, least recently used first
+        self.state = (None, None)     # (url, dom generation) the entries belong to
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, by, match):
+        elements = self.entries.get((by, match))
+        if elements is not None:
+            self.entries.move_to_end((by, match))
+        return elements
+
+    def put(self, by, match, elements):
+        self.entries[(by, match)] = elements
+        self.entries.move_to_end((by, match))
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    # Returns True while the page state is unchanged, otherwise drops every entry
+    def observe(self, url, gen):
+        if self.state == (url, gen):
+            return True
+        self.invalidate()
+        self.state = (url, gen)
+        return False
+
+    def invalidate(self):
+        if self.entries:
+            self.invalidations += 1
+        self.entries.clear()
+        self.state = (None, None)
+
+    def hit(self):
+        self.hits += 1
+
+    def miss(self):
+        self.misses += 1
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "size": len(self.entries),
+        }
+
+
+# Labelled elements, bounded by LRU size and optional TTL, page scoped entries end with the page
+class ElementRegistry:
+    def __init__(self, size=1024, ttl=None):
+        self.size = size
+        self.ttl = ttl or None
+        self.entries = OrderedDict()  # label -> [element, scope, expiry], least recently used first
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, label):
+        return self.get(label) is not None
+
+    def __setitem__(self, label, element):
+        self.put(label, element)
+
+    def __getitem__(self, label):
+        element = self.get(label)
+        if element is None:
+            raise KeyError(label)
+        return element
+
+    def get(self, label, default=None):
+        entry = self.entries.get(label)
+        if entry is None:
+            return default
+        if entry[2] is not None and entry[2] <= time.monotonic():
+            del self.entries[label]
+            self.expirations += 1
+            return default
+        self.entries.move_to_end(label)
+        return entry[0]
+
+    def put(self, label, element, scope="session"):
+        expiry = time.monotonic() + self.ttl if self.ttl else None
+        self.entries[label] = [element, scope, expiry]
+        self.entries.move_to_end(label)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, label, default=None):
+        entry = self.entries.pop(label, None)
+        return entry[0] if entry else default
+
+    def clear(self):
+        self.entries.clear()
+
+    # On navigation page entries go, session entries keep only their locator for re-resolution
+    def new_page(self):
+        for label, (element, scope, _) in list(self.entries.items()):
+            if scope == "page":
+                del self.entries[label]
+            elif element._match is not None:
+                element._match.matches = []
+
+    def prune(self):
+        now = time.monotonic()
+        expired = [label for label, entry in self.entries.items() if entry[2] is not None and entry[2] <= now]
+        for label in expired:
+            del self.entries[label]
+        self.expirations += len(expired)
+        return len(expired)
+
+    # Shallow estimate of what the registry keeps alive, handles are counted by reference
+    def memory(self):
+        total = sys.getsizeof(self.entries)
+        for label, (element, _, _) in self.entries.items():
+            total += sys.getsizeof(label) + sys.getsizeof(element)
+            if element._match is not None:
+                total += sys.getsizeof(element._match) + sys.getsizeof(element._match.matches)
+        return total
+
+    def stats(self):
+        scopes = [entry[1] for entry in self.entries.values()]
+        return {
+            "size": len(self.entries),
+            "page": scopes.count("page"),
+            "session": scopes.count("session"),
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "handles": sum(max(1, len(entry[0].matches)) for entry in self.entries.values()),
+            "bytes": self.memory(),
+        }
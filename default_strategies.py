@@ -1,5 +1,10 @@
 import re, random
 
+from selenium.webdriver.common.keys import Keys
+from runtime import lazy_import
+
+EC = lazy_import("selenium.webdriver.support.expected_conditions")
+
 default_strategies = {
     "find_strategies": {
         "all": lambda els: els,
@@ -41,7 +46,16 @@ default_strategies = {
 
     "go_behaviors": {
         "default": lambda driver, url: driver.get(url),
-        "track_redirect": lambda driver, url: (driver.get(url), time.sleep(1), driver.current_url),
+        "track_redirect": lambda driver, url: (driver.get(url), driver.current_url),
         "reinject": lambda agent: (agent.inject_tracker(), agent.inject_dom_agent()),
+        # Load profile navigations, go() switches to the profile of the same name first
+        "light": lambda driver, url: driver.get(url),
+        "text": lambda driver, url: driver.get(url),
+    },
+
+    "load_profiles": {
+        "full": {"types": []},
+        "light": {"types": ["image", "font", "media", "tracker"]},
+        "text": {"types": ["image", "font", "media", "tracker", "stylesheet"]},
     }
 }
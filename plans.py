@@ -0,0 +1,250 @@
+import json
+
+from selenium.webdriver.common.action_chains import ActionChains
+from selenium.webdriver.common.keys import Keys
+
+from .sbk import BATCH_LOCATORS, LOCATE_JS, Element, Label
+
+# Steps the in-page replayer can perform, anything else runs through PySBK one call at a time
+SCRIPT_CLICKS = {"default", "double"}
+SCRIPT_TYPES = {"default": None, "clear_then_type": None, "type_then_enter": "Enter", "type_then_tab": "Tab"}
+ACTION_TYPES = set(SCRIPT_TYPES) | {"type_then_term"}
+
+# Steps after which the page may be gone, they close the current batch
+BARRIER_TYPES = {"type_then_enter"}
+BARRIER_OPS = {"click"}  # links and submit buttons navigate, later steps belong to the next page
+
+# Performs [{op, by, match, which, behavior|mode, text, key}, ...] in order, returns [steps done, error]
+REPLAY_JS = LOCATE_JS + """
+var steps = arguments[0];
+
+function setValue(el, value) {
+    var desc = Object.getOwnPropertyDescriptor(Object.getPrototypeOf(el), "value");
+    if (desc && desc.set) desc.set.call(el, value); else el.value = value;
+    el.dispatchEvent(new Event("input", {bubbles: true}));
+}
+
+function press(el, key) {
+    ["keydown", "keypress", "keyup"].forEach(function(type) {
+        el.dispatchEvent(new KeyboardEvent(type, {key: key, code: key, bubbles: true, cancelable: true}));
+    });
+}
+
+function perform(s) {
+    var found = locate(s.by, s.match);
+    var el = found && (typeof s.which === "number" ? found[s.which] : found[0]);
+    if (!el) throw new Error("No elements found for " + s.by + "=" + s.match);
+    el.scrollIntoView({block: "center"});
+    if (s.op === "click") {
+        el.click();
+        if (s.behavior === "double") el.click();
+        return;
+    }
+    el.focus();
+    if (s.mode === "clear_then_type") setValue(el, "");
+    setValue(el, (el.value || "") + s.text);
+    el.dispatchEvent(new Event("change", {bubbles: true}));
+    if (s.key === "Enter") {
+        press(el, "Enter");
+        if (el.form) el.form.requestSubmit ? el.form.requestSubmit() : el.form.submit();
+    } else if (s.key === "Tab") {
+        press(el, "Tab");
+        el.blur();
+    }
+}
+
+// A failing step reports its index so the caller resumes there, steps before it are never repeated
+for (var i = 0; i < steps.length; i++) {
+    try {
+        perform(steps[i]);
+    } catch (e) {
+        return [i, String(e)];
+    }
+}
+return [steps.length, null];
+"""
+
+
+# Serializable sequence of recorded steps, compiled into batches per replay mode
+class Plan:
+    def __init__(self, steps=None, name=None):
+        self.steps = list(steps or [])
+        self.name = name
+        self._compiled = {}
+
+    def __repr__(self):
+        return f"<Plan name={self.name} steps={len(self.steps)}>"
+
+    def __len__(self):
+        return len(self.steps)
+
+    def add(self, step):
+        self.steps.append(step)
+        self._compiled.clear()
+        return step
+
+    # Serialization
+    def to_dict(self):
+        return {"name": self.name, "steps": self.steps}
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data.get("steps"), data.get("name"))
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+    def save(self, path):
+        with open(path, "w") as f:
+            f.write(self.to_json())
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r") as f:
+            return cls.from_json(f.read())
+
+    # Compilation, consecutive batchable steps become one segment, waits and navigations stand alone
+    def batchable(self, step, mode):
+        if step["op"] not in ("click", "type") or step["by"] not in BATCH_LOCATORS:
+            return False
+        if step["which"] != "only" and not isinstance(step["which"], int):
+            return False
+        if step["op"] == "click":
+            return step["behavior"] in SCRIPT_CLICKS
+        return step["mode"] in (SCRIPT_TYPES if mode == "script" else ACTION_TYPES)
+
+    def compile(self, mode="script"):
+        if mode in self._compiled:
+            return self._compiled[mode]
+        segments, run = [], []
+        for step in self.steps:
+            if self.batchable(step, mode):
+                run.append(step)
+                if step["op"] in BARRIER_OPS or step.get("mode") in BARRIER_TYPES:
+                    segments.append({"kind": "batch" if len(run) > 1 else "step", "steps": run})
+                    run = []
+                continue
+            if run:
+                segments.append({"kind": "batch" if len(run) > 1 else "step", "steps": run})
+                run = []
+            segments.append({"kind": "step", "steps": [step]})
+        if run:
+            segments.append({"kind": "batch" if len(run) > 1 else "step", "steps": run})
+        self._compiled[mode] = segments
+        return segments
+
+    # Replay, a batch that fails part way continues step by step through PySBK so healing applies
+    def replay(self, bot, mode="script"):
+        for segment in self.compile(mode):
+            remaining = segment["steps"]
+            if segment["kind"] == "batch":
+                done = self.run_batch(bot, remaining, mode)
+                remaining = remaining[done:] if done is not None else None
+            if remaining is None:
+                bot.log.error(f"{self!r} stopped in a batch that may have partly run, not replaying it")
+                return False
+            for step in remaining:
+                if not self.run_step(bot, step):
+                    bot.log.error(f"{self!r} stopped at step {self.steps.index(step)}: {step['op']}")
+                    return False
+        return True
+
+    # Returns how many steps ran, or None when the request failed and that is unknown
+    def run_batch(self, bot, steps, mode):
+        try:
+            if mode == "actions":
+                return self.run_actions(bot, steps)
+            done, error = bot.driver.execute_script(
+                REPLAY_JS, [dict(step, key=SCRIPT_TYPES.get(step.get("mode"))) for step in steps]
+            )
+            if error:
+                bot.log.debug(f"Batched replay stopped at step {done}: {error}")
+            return done
+        except Exception as e:
+            bot.log.error(f"Batched replay failed: {e}")
+            return None
+
+    # One find_many for the targets, then a single W3C Actions request with trusted input events
+    def run_actions(self, bot, steps):
+        targets = bot.find_many([(s["by"], s["match"], s["which"]) for s in steps])
+        if not all(targets):
+            return 0
+        chain = ActionChains(bot.driver)
+        for step, target in zip(steps, targets):
+            el = target.element
+            if step["op"] == "click":
+                chain.double_click(el) if step["behavior"] == "double" else chain.click(el)
+                continue
+            chain.click(el)
+            if step["mode"] == "clear_then_type":
+                chain.key_down(Keys.CONTROL).send_keys("a").key_up(Keys.CONTROL).send_keys(Keys.BACKSPACE)
+            else:
+                chain.send_keys(Keys.END)
+            term = {"type_then_enter": Keys.ENTER, "type_then_tab": Keys.TAB, "type_then_term": step["term"]}
+            chain.send_keys(step["text"] + term.get(step["mode"], ""))
+        chain.perform()
+        return len(steps)
+
+    # Symbolic elements without matches are falsy, so results are checked against None
+    def run_step(self, bot, step):
+        op = step["op"]
+        if op == "click":
+            return bot.click(behavior=step["behavior"], by=step["by"], match=step["match"], which=step["which"]) is not None
+        if op == "type":
+            return bot.type(step["text"], mode=step["mode"], term=step["term"],
+                            by=step["by"], match=step["match"], which=step["which"]) is not None
+        if op in ("expect", "wait"):
+            return bot.wait_for(step["by"], step["match"], step["condition"], step["value"], step["mode"],
+                                timeout=step.get("timeout")) is not None
+        if op == "go":
+            bot.go(step["url"], behavior=step["behavior"])
+            return True
+        raise ValueError(f"Unknown plan step: {op}")
+
+
+# Proxy that records click/type/expect/wait_for/go on a PySBK into a Plan, optionally performing them
+class Recorder:
+    def __init__(self, bot, plan=None, execute=True):
+        self.bot = bot
+        self.plan = plan or Plan()
+        self.execute = execute
+
+    def __getattr__(self, name):
+        return getattr(self.bot, name)
+
+    def locator(self, target=None, which="only", by=None, match=None):
+        if isinstance(target, Label):
+            target = self.bot.registry.get(target.name)
+        if isinstance(target, Element) and target._match:
+            return target._match._by, target._match._value, target.which
+        if by and match:
+            return by, match, which
+        raise ValueError("Only targets with a locator can be recorded")
+
+    def click(self, target=None, behavior="default", **kwargs):
+        by, match, which = self.locator(target, **kwargs)
+        self.plan.add({"op": "click", "by": by, "match": match, "which": which, "behavior": behavior})
+        return self.bot.click(target, behavior, **kwargs) if self.execute else None
+
+    def type(self, text, target=None, mode="default", term="", **kwargs):
+        by, match, which = self.locator(target, **kwargs)
+        self.plan.add({"op": "type", "by": by, "match": match, "which": which, "mode": mode, "text": text, "term": term})
+        return self.bot.type(text, target, mode, term, **kwargs) if self.execute else None
+
+    def expect(self, by, match, condition="present", value=False, mode="partial"):
+        self.plan.add({"op": "expect", "by": by, "match": match, "condition": condition, "value": value, "mode": mode})
+        return self.bot.expect(by, match, condition, value, mode) if self.execute else None
+
+    def wait_for(self, by, match, condition="present", value=False, mode="partial", timeout=None, **kwargs):
+        self.plan.add({"op": "wait", "by": by, "match": match, "condition": condition, "value": value, "mode": mode,
+                       "timeout": timeout})
+        return self.bot.wait_for(by, match, condition, value, mode, timeout, **kwargs) if self.execute else None
+
+    def go(self, url, behavior="default", **kwargs):
+        self.plan.add({"op": "go", "url": url, "behavior": behavior})
+        return self.bot.go(url, behavior=behavior, **kwargs) if self.execute else None
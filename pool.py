@@ -0,0 +1,199 @@
+import threading, time
+from contextlib import contextmanager
+
+from .runtime import url_origin
+from .sebrowser import active_profiles, registered_sessions, session_origins
+
+# Clears the current origin's storage, IndexedDB only where the browser can list databases
+CLEAR_STORAGE_JS = """
+var done = arguments[arguments.length - 1];
+try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}
+if (!window.indexedDB || !indexedDB.databases) return done(true);
+indexedDB.databases().then(function(databases) {
+    databases.forEach(function(db) { indexedDB.deleteDatabase(db.name); });
+    done(true);
+}, function() { done(true); });
+"""
+
+# Warm WebDriver session pool shared across PySBK instances
+class DriverPool:
+    def __init__(self, browser, sizes=None, size=2, max_leases=50, mode="headless"):
+        self.browser = browser  # SeleniumBrowser used as the driver factory
+        self.sizes = sizes or {}  # per browser name capacity, falls back to size
+        self.size = size
+        self.max_leases = max_leases
+        self.mode = mode
+        self.log = browser.log
+
+        self._cond = threading.Condition()
+        self._idle = {}    # name -> [driver, ...]
+        self._count = {}   # name -> drivers alive (idle + leased)
+        self._leases = {}  # id(driver) -> times leased
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def capacity(self, name):
+        return int(self.sizes.get(name, self.size))
+
+    # Lease management
+    def checkout(self, name, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            driver = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("DriverPool is closed")
+                    idle = self._idle.setdefault(name, [])
+                    if idle:
+                        driver = idle.pop()
+                        break
+                    if self._count.get(name, 0) < self.capacity(name):
+                        self._count[name] = self._count.get(name, 0) + 1
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No {name} driver available within {timeout}s")
+                    self._cond.wait(remaining)
+
+            if driver is None:
+                try:
+                    driver = self.browser.new_driver(name, self.mode)
+                except Exception:
+                    self._forget(name, None)
+                    raise
+                self.log.debug(f"Pool launched new {name} driver")
+            elif not self.health_check(driver):
+                self.log.info(f"Pool dropping unhealthy {name} driver")
+                self._discard(name, driver)
+                continue
+
+            with self._cond:
+                self._leases[id(driver)] = self._leases.get(id(driver), 0) + 1
+            return driver
+
+    def checkin(self, name, driver, reset=True):
+        with self._cond:
+            leases = self._leases.get(id(driver), 0)
+            closed = self._closed
+        if closed or leases >= self.max_leases:
+            self.log.debug(f"Pool recycling {name} driver after {leases} leases")
+            self._discard(name, driver)
+            return
+        if reset and not self.reset(driver):
+            self._discard(name, driver)
+            return
+        with self._cond:
+            self._idle.setdefault(name, []).append(driver)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self, name, timeout=None):
+        driver = self.checkout(name, timeout)
+        try:
+            yield driver
+        finally:
+            self.checkin(name, driver)
+
+    # Driver state
+    def health_check(self, driver):
+        try:
+            driver.current_window_handle
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    # Origins a window reached, its navigation history covers clicks, redirects and driver.get() too
+    def window_origins(self, driver, cdp):
+        origins = {url_origin(driver.current_url)}
+        if cdp:
+            history = driver.execute_cdp_cmd("Page.getNavigationHistory", {})
+            origins.update(url_origin(entry["url"]) for entry in history.get("entries", []))
+        return origins
+
+    # Cookies also name origins only seen in frames or redirect hops
+    def cookie_origins(self, driver):
+        origins = set()
+        for cookie in driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", []):
+            domain = cookie["domain"].lstrip(".")
+            origins.update({f"https://{domain}", f"http://{domain}"})
+        return origins
+
+    # Storage of every origin used during the lease goes, with CDP in place, otherwise by visiting each origin
+    def reset(self, driver):
+        origins = session_origins.pop(driver.session_id, set())
+        cdp = hasattr(driver, "execute_cdp_cmd")
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                origins.update(self.window_origins(driver, cdp))
+                driver.close()
+            driver.switch_to.window(handles[0])
+            origins.update(self.window_origins(driver, cdp))
+            registered_sessions.get(driver.session_id, set()).intersection_update(handles[:1])
+            origins.discard(None)
+            if cdp:
+                origins.update(self.cookie_origins(driver))
+                for origin in origins:
+                    driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+                driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            else:
+                self.clear_origins(driver, origins)
+            # URL blocking outlives the lease, hand the next borrower the factory's load profile
+            if active_profiles.get(driver.session_id, "full") != self.browser.load_profile:
+                self.browser.apply_load_profile(self.browser.load_profile, driver)
+            driver.get("about:blank")
+            return True
+        except Exception as e:
+            self.log.error(f"Pool reset failed: {e}")
+            return False
+
+    # WebDriver reaches cookies and storage of the current document only, so each origin is visited in turn
+    def clear_origins(self, driver, origins):
+        for origin in origins:
+            driver.get(f"{origin}/robots.txt")
+            if url_origin(driver.current_url) != origin:
+                raise RuntimeError(f"{origin} redirected to {driver.current_url}, its storage was not cleared")
+            driver.delete_all_cookies()
+            driver.execute_async_script(CLEAR_STORAGE_JS)
+
+    def _forget(self, name, driver):
+        with self._cond:
+            self._count[name] = max(0, self._count.get(name, 0) - 1)
+            if driver is not None:
+                self._leases.pop(id(driver), None)
+            self._cond.notify()
+
+    def _discard(self, name, driver):
+        self._forget(name, driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        self.browser.discard_clone(driver)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, {}
+            self._cond.notify_all()
+        for name, drivers in idle.items():
+            for driver in drivers:
+                self._discard(name, driver)
+
+    def stats(self):
+        with self._cond:
+            return {
+                name: {
+                    "capacity": self.capacity(name),
+                    "alive": count,
+                    "idle": len(self._idle.get(name, [])),
+                }
+                for name, count in self._count.items()
+            }
@@ -0,0 +1,131 @@
+import json, threading, time
+from bisect import bisect_left
+from functools import wraps
+
+# Latency histogram bucket upper bounds, in seconds
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf"))
+
+# Public action methods timed when instrumentation is enabled
+ACTIONS = ("find", "find_many", "click", "type", "expect", "wait", "go", "launch_browser")
+
+
+# Opt-in timing of WebDriver commands and PySBK actions
+class Profiler:
+    def __init__(self, hooks=None):
+        self.hooks = list(hooks or [])  # called as hook(kind, name, elapsed, round_trips)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {}
+
+    def add_hook(self, hook):
+        self.hooks.append(hook)
+        return hook
+
+    def reset(self):
+        with self._lock:
+            self._stats = {}
+
+    # Recording
+    def record(self, kind, name, elapsed, round_trips=0):
+        key = f"{kind}:{name}"
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                entry = self._stats[key] = {
+                    "count": 0, "total": 0.0, "min": elapsed, "max": elapsed,
+                    "round_trips": 0, "buckets": [0] * len(BUCKETS),
+                }
+            entry["count"] += 1
+            entry["total"] += elapsed
+            entry["min"] = min(entry["min"], elapsed)
+            entry["max"] = max(entry["max"], elapsed)
+            entry["round_trips"] += round_trips
+            entry["buckets"][bisect_left(BUCKETS, elapsed)] += 1
+        for hook in self.hooks:
+            try:
+                hook(kind, name, elapsed, round_trips)
+            except Exception:
+                pass
+
+    def timed(self, kind, name, fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            # Actions on this thread count the commands issued while they run
+            stack = self._local.__dict__.setdefault("stack", [])
+            stack.append(0)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                round_trips = stack.pop()
+                if stack:
+                    stack[-1] += round_trips
+                self.record(kind, name, elapsed, round_trips)
+        return wrapper
+
+    # Instrumentation
+    def instrument(self, obj, methods=ACTIONS):
+        for name in methods:
+            method = getattr(obj, name, None)
+            if callable(method):
+                setattr(obj, name, self.timed("action", name, method))
+        return obj
+
+    def instrument_driver(self, driver):
+        executor = driver.command_executor
+        execute = getattr(executor, "_pysbk_execute", executor.execute)
+
+        @wraps(execute)
+        def timed_execute(command, params=None):
+            start = time.perf_counter()
+            try:
+                return execute(command, params)
+            finally:
+                elapsed = time.perf_counter() - start
+                stack = self._local.__dict__.get("stack")
+                if stack:
+                    stack[-1] += 1
+                self.record("command", command, elapsed, 1)
+
+        executor._pysbk_execute = execute  # re-instrumenting replaces rather than stacks wrappers
+        executor.execute = timed_execute
+        return driver
+
+    # Reporting
+    def stats(self):
+        with self._lock:
+            snapshot = {key: dict(entry, buckets=list(entry["buckets"])) for key, entry in self._stats.items()}
+        for entry in snapshot.values():
+            entry["mean"] = entry["total"] / entry["count"]
+            for name, q in (("p50", 0.50), ("p90", 0.90), ("p99", 0.99)):
+                entry[name] = min(self.percentile(entry["buckets"], q), entry["max"])
+            entry["histogram"] = {str(bound): n for bound, n in zip(BUCKETS, entry.pop("buckets")) if n}
+        return snapshot
+
+    def totals(self):
+        stats = self.stats()
+        commands = [e for k, e in stats.items() if k.startswith("command:")]
+        return {
+            "round_trips": sum(e["count"] for e in commands),
+            "command_time": sum(e["total"] for e in commands),
+        }
+
+    @staticmethod
+    def percentile(buckets, q):
+        total = sum(buckets)
+        if not total:
+            return None
+        seen = 0
+        for bound, n in zip(BUCKETS, buckets):
+            seen += n
+            if seen >= q * total:
+                return bound
+        return BUCKETS[-1]
+
+    def to_json(self, path=None):
+        report = json.dumps({"totals": self.totals(), "stats": self.stats()}, indent=2)
+        if path:
+            with open(path, "w") as f:
+                f.write(report)
+        return report
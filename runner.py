@@ -0,0 +1,215 @@
+import os, queue, shutil, signal, threading, time, traceback
+import multiprocessing as mp
+from collections import deque
+from itertools import count
+
+
+#   Worker loop, one headless browser per worker serving tasks from its inbox
+def worker_main(wid, job, browser, bot_kwargs, inbox, outbox, shared=None):
+    if shared is None and hasattr(os, "setsid"):
+        os.setsid()  # own process group, so a kill also takes chromedriver and the browser down
+
+    from .sbk import PySBK
+
+    try:
+        bot = PySBK(**bot_kwargs)
+        bot.launch_browser(browser, mode="headless")
+        if not bot.driver:
+            raise RuntimeError(f"Failed to launch {browser}: {bot.last_error}")
+    except Exception:
+        outbox.put(("failed", wid, traceback.format_exc()))
+        return
+    if shared is not None:
+        shared["bot"] = bot
+    # The supervisor removes these profile clones itself if it has to SIGKILL the worker
+    outbox.put(("ready", wid, list(bot.clones.values())))
+
+    try:
+        while True:
+            item = inbox.get()
+            if item is None:
+                break
+            index, task = item
+            start = time.monotonic()
+            try:
+                value, error = job(bot, task), None
+            except Exception:
+                value, error = None, traceback.format_exc()
+            outbox.put(("done", wid, (index, value, error, time.monotonic() - start)))
+    finally:
+        bot.stop_browser(browser)
+
+
+class Worker:
+    def __init__(self, wid, runner):
+        self.wid = wid
+        self.mode = runner.mode
+        self.ready = False
+        self.clones = []      # profile clones reported by the worker, removed on kill in process mode
+        self.task = None      # (index, task, attempts) currently assigned
+        self.started = None
+        if self.mode == "process":
+            self.inbox = runner.ctx.Queue()
+            self.shared = None
+            self.handle = runner.ctx.Process(
+                target=worker_main,
+                args=(wid, runner.job, runner.browser, runner.bot_kwargs, self.inbox, runner.outbox),
+                daemon=True,
+            )
+        else:
+            self.inbox = queue.Queue()
+            self.shared = {}
+            self.handle = threading.Thread(
+                target=worker_main,
+                args=(wid, runner.job, runner.browser, runner.bot_kwargs, self.inbox, runner.outbox, self.shared),
+                daemon=True,
+            )
+        self.handle.start()
+
+    def assign(self, item):
+        self.task = item
+        self.started = time.monotonic()
+        self.inbox.put(item[:2])
+
+    def alive(self):
+        return self.handle.is_alive()
+
+    def stop(self):
+        self.inbox.put(None)
+
+    def kill(self):
+        if self.mode == "process":
+            try:
+                os.killpg(self.handle.pid, signal.SIGKILL)
+            except (AttributeError, OSError):
+                self.handle.kill()
+            self.handle.join(5)
+            for clone in self.clones:
+                shutil.rmtree(clone, ignore_errors=True)
+        else:
+            # Threads cannot be killed, quitting the driver unblocks the pending command
+            self.inbox.put(None)
+            bot = self.shared.get("bot")
+            if bot and bot.driver:
+                try:
+                    bot.driver.quit()
+                except Exception:
+                    pass
+                bot.discard_clone(bot.driver)
+
+
+# Shards tasks across N headless browser workers, streaming results as they complete
+class JobRunner:
+    def __init__(self, job, workers=None, mode="process", browser="chromium", timeout=60,
+                 retries=0, max_restarts=None, start_method=None, **bot_kwargs):
+        self.job = job  # job(bot, task) -> value, must be picklable in process mode
+        self.workers = workers or os.cpu_count() or 1
+        self.mode = mode
+        self.browser = browser
+        self.timeout = timeout
+        self.retries = retries
+        self.max_restarts = self.workers * 4 if max_restarts is None else max_restarts
+        self.bot_kwargs = bot_kwargs
+        self.ctx = mp.get_context(start_method)
+        self.outbox = self.ctx.Queue() if mode == "process" else queue.Queue()
+        self._ids = count()
+        self.restarts = 0
+
+    def spawn(self):
+        wid = next(self._ids)
+        return wid, Worker(wid, self)
+
+    def result(self, item, value=None, error=None, elapsed=None, worker=None):
+        return {"index": item[0], "task": item[1], "value": value, "error": error,
+                "elapsed": elapsed, "attempts": item[2] + 1, "worker": worker}
+
+    def run(self, tasks):
+        tasks = iter(enumerate(tasks))
+        retry = deque()
+        pool = dict(self.spawn() for _ in range(self.workers))
+
+        def next_item():
+            if retry:
+                return retry.popleft()
+            index, task = next(tasks, (None, None))
+            return None if index is None else (index, task, 0)
+
+        def replace(worker):
+            del pool[worker.wid]
+            if self.restarts < self.max_restarts:
+                self.restarts += 1
+                wid, new = self.spawn()
+                pool[wid] = new
+
+        def fail(worker, reason):
+            item = worker.task
+            worker.task = None
+            if item[2] < self.retries:
+                retry.append((item[0], item[1], item[2] + 1))
+                return None
+            return self.result(item, error=reason, worker=worker.wid)
+
+        exhausted = False
+        try:
+            while pool:
+                # Hand out work to idle workers, the timeout clock starts here
+                for worker in pool.values():
+                    if worker.ready and worker.task is None and not exhausted:
+                        item = next_item()
+                        if item is None:
+                            exhausted = True
+                            break
+                        worker.assign(item)
+
+                busy = any(w.task for w in pool.values())
+                if exhausted and not busy and not retry:
+                    break
+
+                try:
+                    kind, wid, payload = self.outbox.get(timeout=0.1)
+                except queue.Empty:
+                    kind = None
+
+                worker = pool.get(wid) if kind else None
+                if worker and kind == "ready":
+                    worker.ready, worker.clones = True, payload or []
+                elif worker and kind == "failed":
+                    print(f"[JobRunner] Worker {wid} failed to start: {payload}")
+                    replace(worker)
+                elif worker and kind == "done" and worker.task:
+                    index, value, error, elapsed = payload
+                    yield self.result(worker.task, value, error, elapsed, wid)
+                    worker.task = None
+
+                # Timeouts and crashes, the worker is replaced and its task retried or failed
+                now = time.monotonic()
+                for worker in list(pool.values()):
+                    if worker.task and self.timeout and now - worker.started > self.timeout:
+                        worker.kill()
+                        outcome = fail(worker, f"Timed out after {self.timeout}s")
+                        replace(worker)
+                    elif not worker.alive():
+                        worker.kill()  # the browser may have outlived the worker, and the clone with it
+                        outcome = fail(worker, "Worker crashed") if worker.task else None
+                        replace(worker)
+                    else:
+                        continue
+                    if outcome:
+                        yield outcome
+                if retry:
+                    exhausted = False
+
+                if not pool:
+                    # Out of restarts, report everything left as failed
+                    for item in list(retry) + [(i, t, 0) for i, t in tasks]:
+                        yield self.result(item, error="No workers available")
+        finally:
+            for worker in pool.values():
+                worker.stop()
+            for worker in pool.values():
+                worker.handle.join(10)
+                if worker.alive():
+                    worker.kill()
+
+    def map(self, tasks):
+        return sorted(self.run(tasks), key=lambda r: r["index"])
@@ -1,10 +1,25 @@
 import os
 import configparser
 import logging
+import logging.handlers
 import platform
-#import json
+import sys
+import atexit
+import copy
+import fnmatch
+import queue
+import random
+import threading
+import time
+import json
+import gzip
 import importlib.util
+import hashlib
+import shutil
+import subprocess
+import tempfile
 from pathlib import Path
+from urllib.parse import urlsplit
 
 system = platform.system()
 home = Path.home()
@@ -41,44 +56,413 @@ def resolve_profile(name: str) -> tuple[str, str]:
         return (str(base / "microsoft-edge"), str(base))
     return ("", "")
 
+#   Profile cloning, a cache-free template snapshot per source profile, copied per session
+PROFILE_SKIP = (
+    "Cache", "Code Cache", "GPUCache", "ShaderCache", "GrShaderCache", "DawnCache", "CacheStorage",
+    "Crashpad", "cache2", "startupCache", "SingletonLock", "SingletonSocket", "SingletonCookie",
+    "lock", ".parentlock", "parent.lock",
+)
+TEMPLATE_MARKER = ".pysbk-template"
+TEMPLATE_GRACE = 3600  # seconds a superseded template version stays for clones still copying from it
+template_lock = threading.Lock()
+
+# Files holding login state, Chromium profiles are one level below the user data dir, Firefox at the top
+PROFILE_STATE = (
+    "Local State", "*/Cookies", "*/Network/Cookies", "*/Preferences", "*/Login Data", "*/Web Data",
+    "*/Local Storage/leveldb/*", "*/Session Storage/*", "*/IndexedDB/*",
+    "cookies.sqlite*", "prefs.js", "logins.json", "key4.db", "webappsstore.sqlite*", "storage/default/*",
+)
+
+# Other files browsers rewrite in place, SQLite journals and LevelDB logs, never hardlinked into a clone
+PROFILE_MUTABLE = ("*-journal", "*-wal", "*-shm", "*.log", "LOG", "LOG.old", "CURRENT", "MANIFEST-*", "LOCK", "*.json")
+
+# Changes whenever a login state file is added, removed, resized or rewritten
+def profile_fingerprint(source: Path) -> str:
+    digest = hashlib.sha1()
+    if source.exists():
+        for path in sorted({p for pattern in PROFILE_STATE for p in source.glob(pattern)}):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            digest.update(f"{path.relative_to(source)}:{stat.st_mtime_ns}:{stat.st_size};".encode())
+    return digest.hexdigest()
+
+def template_versions(root: Path) -> list[tuple[float, Path, dict]]:
+    versions = []
+    for path in root.iterdir() if root.exists() else []:
+        try:
+            marker = json.loads((path / TEMPLATE_MARKER).read_text())
+            versions.append((marker["built"], path, marker))
+        except (OSError, ValueError, KeyError):
+            continue
+    return sorted(versions, key=lambda v: v[0])
+
+# Superseded versions and abandoned staging directories go once nothing can still be copying from them
+def prune_templates(root: Path, versions):
+    now = time.time()
+    if versions and now - versions[-1][0] > TEMPLATE_GRACE:
+        for _, path, _ in versions[:-1]:
+            shutil.rmtree(path, ignore_errors=True)
+    for path in root.glob(".staging-*"):
+        try:
+            if now - path.stat().st_mtime > TEMPLATE_GRACE:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            pass
+
+# Templates are versioned as templates/<source key>/<version>, a published version is never modified,
+# so processes sharing the data directory can build and copy concurrently without a lock
+def profile_template(source: str, refresh=False, app_name="PySBK") -> Path:
+    source = Path(source)
+    key = hashlib.sha1(str(source).encode()).hexdigest()[:16]
+    root = get_platform_dir(app_name, "data") / "templates" / key
+    fingerprint = profile_fingerprint(source)
+    with template_lock:  # threads of one process share a build, other processes may build their own
+        versions = template_versions(root)
+        prune_templates(root, versions)
+        if versions and not refresh and versions[-1][2].get("fingerprint") == fingerprint:
+            return versions[-1][1]
+        root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".staging-", dir=root))
+        try:
+            shutil.rmtree(staging)
+            if source.exists():
+                shutil.copytree(source, staging, symlinks=True, ignore=shutil.ignore_patterns(*PROFILE_SKIP))
+            else:
+                staging.mkdir(parents=True)
+            marker = {"source": str(source), "fingerprint": fingerprint, "built": time.time()}
+            (staging / TEMPLATE_MARKER).write_text(json.dumps(marker))
+            template = root / f"{fingerprint[:16]}-{time.time_ns()}-{os.getpid()}"
+            os.rename(staging, template)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+    return template
+
+def profile_state_file(relative: Path) -> bool:
+    parts = relative.parts
+    names = ["/".join(parts[:n]) for n in range(1, len(parts) + 1)]
+    return any(fnmatch.fnmatchcase(name, pattern) for name in names for pattern in PROFILE_STATE)
+
+# Hardlinks share the inode with the template and every other clone, only files nothing writes may be linked
+def link_or_copy(template: Path):
+    def copy(src, dst):
+        path = Path(src)
+        mutable = profile_state_file(path.relative_to(template))
+        mutable = mutable or any(fnmatch.fnmatchcase(path.name, pattern) for pattern in PROFILE_MUTABLE)
+        if not mutable:
+            try:
+                with open(path, "rb") as f:
+                    mutable = f.read(16) == b"SQLite format 3\x00"
+            except OSError:
+                mutable = True
+        return shutil.copy2(src, dst) if mutable else os.link(src, dst)
+    return copy
+
+def clone_tree(template: Path, target: Path, method="auto"):
+    # Reflinks are copy-on-write, hardlinks share file contents with the template and other clones
+    if method in ("auto", "reflink"):
+        flag = ["-c"] if system == "Darwin" else ["--reflink=always"]
+        try:
+            result = subprocess.run(["cp", "-a", *flag, f"{template}/.", str(target)], capture_output=True)
+            error = result.stderr.decode().strip() if result.returncode else None
+        except OSError as e:
+            error = str(e)  # no cp on this platform
+        if error is None:
+            return "reflink"
+        if method == "reflink":
+            raise OSError(error or "reflink copy failed")
+        shutil.rmtree(target, ignore_errors=True)
+    copy = link_or_copy(template) if method == "hardlink" else shutil.copy2
+    shutil.copytree(template, target, symlinks=True, copy_function=copy, dirs_exist_ok=True)
+    return "hardlink" if method == "hardlink" else "copy"
+
+def clone_profile(source: str, method="auto", base_dir=None, prefix="pysbk-", refresh=False, app_name="PySBK") -> tuple[str, str]:
+    template = profile_template(source, refresh, app_name)
+    target = Path(tempfile.mkdtemp(prefix=prefix, dir=base_dir))
+    try:
+        used = clone_tree(template, target, method)
+    except BaseException:
+        shutil.rmtree(target, ignore_errors=True)
+        raise
+    (target / TEMPLATE_MARKER).unlink(missing_ok=True)
+    return str(target), used
+
+#   Deferred module import, the module executes on first attribute access
+def lazy_import(name: str):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+#   Resource blocking for load profiles, URL patterns per resource type
+RESOURCE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", "*.bmp"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "media": ["*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav", "*.m4a", "*.m3u8", "*.mpd"],
+    "stylesheet": ["*.css"],
+    "tracker": [
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*facebook.net*", "*connect.facebook.com*", "*hotjar.com*", "*segment.io*",
+        "*scorecardresearch.com*", "*adservice.google.*", "*amazon-adsystem.com*",
+    ],
+}
+
+# Firefox has no URL blocking outside extensions, so profiles map to preferences there
+FIREFOX_RESOURCE_PREFS = {
+    "image": {"permissions.default.image": 2},
+    "font": {"browser.display.use_document_fonts": 0, "gfx.downloadable_fonts.enabled": False},
+    "media": {"media.autoplay.default": 5, "media.autoplay.blocking_policy": 2},
+    "stylesheet": {"permissions.default.stylesheet": 2},
+    "tracker": {"privacy.trackingprotection.enabled": True},
+}
+
+def profile_patterns(profile: dict) -> list:
+    patterns = []
+    for kind in profile.get("types", []):
+        patterns.extend(RESOURCE_PATTERNS.get(kind, []))
+    return patterns + list(profile.get("patterns", []))
+
+def profile_prefs(profile: dict) -> dict:
+    prefs = {}
+    for kind in profile.get("types", []):
+        prefs.update(FIREFOX_RESOURCE_PREFS.get(kind, {}))
+    return prefs
+
+def block_resources(driver, profile: dict) -> bool:
+    if not hasattr(driver, "execute_cdp_cmd"):
+        return False
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": profile_patterns(profile)})
+    return True
+
+#   Browser detection cache
+def detection_cache_path(app_name="PySBK") -> Path:
+    return get_platform_dir(app_name, "data") / "detection.json"
+
+def load_detection_cache(app_name="PySBK") -> dict:
+    try:
+        with open(detection_cache_path(app_name), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_detection_cache(cache: dict, app_name="PySBK"):
+    path = detection_cache_path(app_name)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+def binary_key(binary: str) -> str:
+    try:
+        mtime = os.stat(binary).st_mtime_ns
+    except OSError:
+        mtime = 0
+    return f"{binary}:{mtime}"
+
+# scheme://host[:port] for http(s) URLs, None for about:, data: and the like
+def url_origin(url):
+    parts = urlsplit(url or "")
+    return f"{parts.scheme}://{parts.netloc}" if parts.scheme in ("http", "https") and parts.netloc else None
+
+#   Session snapshots, cookies and web storage as gzipped compact JSON
+def session_path(name="default", app_name="PySBK") -> Path:
+    return get_platform_dir(app_name, "data") / "sessions" / f"{name}.json.gz"
+
+def save_snapshot(path, snapshot: dict):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    # Snapshots hold HttpOnly auth cookies, only the owner may read them
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with gzip.open(os.fdopen(fd, "wb"), "wt", encoding="utf-8") as f:
+        json.dump(snapshot, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+def load_snapshot(path) -> dict:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+#   In-memory asset cache, re-read only when the file changes
+_assets = {}
+
+def read_asset(path) -> str:
+    path = str(path)
+    mtime = os.stat(path).st_mtime_ns
+    cached = _assets.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, "r") as f:
+        source = f.read()
+    _assets[path] = (mtime, source)
+    return source
+
+#   Strategy registry, loads each strategy file once per process and
+#   re-executes it only when its mtime changes
+STRATEGY_TABLES = ("find_strategies", "click_behaviors", "type_modes", "expect_conditions", "go_behaviors", "load_profiles")
+
+class StrategyRegistry:
+    def __init__(self, app_name="PySBK"):
+        self.app_name = app_name
+        self._lock = threading.Lock()
+        self._modules = {}     # path -> (mtime, strategies)
+        self._signature = None
+        self._tables = None
+
+    def files(self) -> list:
+        # Lowest priority first: bundled defaults, then user config, then project-local
+        paths = [
+            Path(__file__).parent / "default_strategies.py",  # fallback
+            get_platform_dir(self.app_name, "config") / "strategies",  # user config
+            Path.cwd() / "strategies",  # project-local
+        ]
+        files = []
+        for path in paths:
+            if path.is_dir():
+                files.extend(sorted(path.glob("*.py")))
+            elif path.is_file() and path.suffix == ".py":
+                files.append(path)
+        return files
+
+    def load(self, force=False) -> dict:
+        with self._lock:
+            signature = []
+            for file in self.files():
+                mtime = file.stat().st_mtime_ns
+                cached = self._modules.get(file)
+                if force or not cached or cached[0] != mtime:
+                    self._modules[file] = (mtime, self.exec_file(file))
+                signature.append((file, mtime))
+
+            if force or signature != self._signature:
+                self._modules = {file: self._modules[file] for file, _ in signature}
+                self._tables = self.merge(self._modules[file][1] for file, _ in signature)
+                self._signature = signature
+            return self._tables
+
+    def reload(self) -> dict:
+        return self.load(force=True)
+
+    @staticmethod
+    def exec_file(file) -> dict:
+        spec = importlib.util.spec_from_file_location(file.stem, file)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        return getattr(mod, "default_strategies", {})
+
+    @staticmethod
+    def merge(layers) -> dict:
+        # Tables merge entry by entry so an override file only needs the entries it changes
+        tables = {name: {} for name in STRATEGY_TABLES}
+        for strategies in layers:
+            for name, table in strategies.items():
+                if isinstance(table, dict):
+                    tables.setdefault(name, {}).update(table)
+                else:
+                    tables[name] = table
+        return tables
+
+strategy_registry = StrategyRegistry()
+
 #   Strategy loader
 def load_strategies(app_name="PySBK") -> dict:
-    paths = [
-        Path.cwd() / "strategies",  # project-local
-        get_platform_dir(app_name, "config") / "strategies",  # user config
-        Path(__file__).parent / "default_strategies.py"  # fallback
-    ]
-
-    strategies = {}
-    for path in paths:
-        if path.is_dir():
-            for file in path.glob("*.py"):
-                mod_name = file.stem
-                spec = importlib.util.spec_from_file_location(mod_name, file)
-                mod = importlib.util.module_from_spec(spec)
-                spec.loader.exec_module(mod)
-                strategies.update(getattr(mod, "default_strategies", {}))
-        elif path.is_file() and path.suffix == ".py":
-            spec = importlib.util.spec_from_file_location("default_strategies", path)
-            mod = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(mod)
-            strategies.update(getattr(mod, "default_strategies", {}))
-    return strategies
+    if app_name == strategy_registry.app_name:
+        return strategy_registry.load()
+    return StrategyRegistry(app_name).load()
 
 #   Logger setup
-def setup_logger(name="PySBK", log_to_file=False, log_file="pysbk.log", level=logging.INFO):
-    logger = logging.getLogger(name)
-    logger.setLevel(level)
+#   Structured sink, one JSON object per line, debug records sampled at sample_rate
+class JsonLinesHandler(logging.Handler):
+    def __init__(self, path, sample_rate=1.0):
+        super().__init__()
+        self.stream = open(path, "a", encoding="utf-8")
+        self.sample_rate = sample_rate
+
+    def emit(self, record):
+        if record.levelno <= logging.DEBUG and self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            return
+        try:
+            entry = {
+                "ts": record.created,
+                "logger": record.name,
+                "level": record.levelname,
+                "msg": record.getMessage(),
+                "thread": record.threadName,
+            }
+            if record.exc_info:
+                entry["exc"] = logging.Formatter().formatException(record.exc_info)
+            self.stream.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self.stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        self.stream.close()
+        super().close()
+
+# Records stay in-process, so exc_info is kept for each sink to format instead of merged into msg
+class RecordQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+# Loggers get one QueueHandler each, a single listener thread per logger does all the I/O
+_listeners = {}
+_listeners_lock = threading.Lock()
+
+def setup_logger(name="PySBK", log_to_file=None, log_file=None, level=None, json_file=None, json_sample=None):
+    with _listeners_lock:
+        logger = logging.getLogger(name)
+        if name in _listeners:
+            if level is not None:
+                logger.setLevel(level)
+            return logger
+
+        config = load_user_config()
+        log_to_file = config.get("log_to_file", "false") in (True, "true") if log_to_file is None else log_to_file
+        log_file = log_file or config.get("log_file", "pysbk.log")
+        level = level or config.get("log_level", "INFO")
+        json_file = json_file or config.get("log_json")
+        json_sample = float(config.get("log_json_sample", 1.0) if json_sample is None else json_sample)
+        logger.setLevel(level.upper() if isinstance(level, str) else level)
 
-    formatter = logging.Formatter("[%(asctime)s] [%(name)s] [%(levelname)s] %(message)s")
+        formatter = logging.Formatter("[%(asctime)s] [%(name)s] [%(levelname)s] %(message)s")
+        handlers = [logging.StreamHandler()]
+        if log_to_file:
+            handlers.append(logging.FileHandler(log_file))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        if json_file:
+            handlers.append(JsonLinesHandler(json_file, json_sample))
 
-    stream_handler = logging.StreamHandler()
-    stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
+        log_queue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)  # drains queued records on interpreter exit
+        logger.addHandler(RecordQueueHandler(log_queue))
+        _listeners[name] = listener
+        return logger
 
-    if log_to_file:
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+# Forked workers inherit the queues but not the listener threads, so each child starts its own
+def _restart_listeners():
+    global _listeners_lock
+    _listeners_lock = threading.Lock()
+    for listener in _listeners.values():
+        listener._thread = None
+        listener.start()
 
-    return logger
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_listeners)
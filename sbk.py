@@ -1,11 +1,127 @@
 import time
+from contextlib import contextmanager
 
 from . import WebDriverWait
-from sebrowser import SeleniumBrowser
-from runtime import load_strategies
+from selenium.common.exceptions import StaleElementReferenceException
+from .sebrowser import SeleniumBrowser, active_profiles, script_timeouts, session_origins
+from .runtime import STRATEGY_TABLES, load_strategies, strategy_registry, url_origin
+from .cache import ElementRegistry, FindCache
+from .waits import Condition, OBSERVE_JS, OBSERVE_SLICE, WaitCancelled, cancellable, document_unloaded
+
+# Locator types the in-page resolver understands, anything else is looked up per selector
+BATCH_LOCATORS = {"css selector", "xpath", "id", "name", "class name", "tag name"}
+
+# In-page locator shared by the batched lookups, returns null for selectors the page rejects
+LOCATE_JS = """
+function locate(by, match) {
+    try {
+        if (by === "xpath") {
+            var snap = document.evaluate(match, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var found = [];
+            for (var j = 0; j < snap.snapshotLength; j++) {
+                if (snap.snapshotItem(j).nodeType === 1) found.push(snap.snapshotItem(j));
+            }
+            return found;
+        }
+        if (by === "tag name") {
+            return Array.prototype.slice.call(document.getElementsByTagName(match));
+        }
+        var css = by === "id" ? '[id="' + CSS.escape(match) + '"]'
+            : by === "name" ? '[name="' + CSS.escape(match) + '"]'
+            : by === "class name" ? "." + CSS.escape(match)
+            : match;
+        return Array.prototype.slice.call(document.querySelectorAll(css));
+    } catch (e) {
+        return null;
+    }
+}
+"""
+
+# Resolves [[by, match], ...] in one round trip, null entries are retried over WebDriver
+FIND_MANY_JS = LOCATE_JS + """
+return arguments[0].map(function(spec) { return locate(spec[0], spec[1]); });
+"""
+
+# Returns [url, dom generation, elements], elements are skipped while the cached state is still current
+FIND_CACHED_JS = LOCATE_JS + """
+var by = arguments[0], match = arguments[1], url = arguments[2], gen = arguments[3], batch = arguments[4];
+var agent = window._PySBK, current = agent && agent.gen !== undefined ? agent.doc + ":" + agent.gen : null;
+if (current !== null && current === gen && location.href === url) return [url, current, null];
+return [location.href, current, batch ? locate(by, match) : null];
+"""
+
+# Collects fields for every element in one round trip, returned column-oriented
+EXTRACT_JS = """
+var els = arguments[0], fields = arguments[1], out = {};
+fields.forEach(function(f) { out[f] = []; });
+els.forEach(function(el) {
+    fields.forEach(function(f) {
+        var v;
+        if (f === "text") {
+            v = (el.innerText || el.textContent || "").trim();
+        } else if (f === "rect") {
+            var r = el.getBoundingClientRect();
+            v = {x: r.x, y: r.y, width: r.width, height: r.height};
+        } else if (f === "tag") {
+            v = el.tagName.toLowerCase();
+        } else if (f === "html") {
+            v = el.outerHTML;
+        } else {
+            var prop = el[f];
+            var t = typeof prop;
+            v = (t === "string" || t === "number" || t === "boolean") ? prop : el.getAttribute(f);
+        }
+        out[f].push(v);
+    });
+});
+return out;
+"""
+
+# Waits in-page for the wanted readyState and a stable URL, reports navigation timing and bytes transferred
+NAV_SETTLE_JS = """
+var want = arguments[0], settle = arguments[1], deadline = Date.now() + arguments[2];
+var expect = arguments[3], started = arguments[4], done = arguments[arguments.length - 1];
+var order = {loading: 0, interactive: 1, complete: 2};
+var last = location.href, since = Date.now();
+// With an expected URL the document must come from this navigation, not the one being replaced
+function fresh() {
+    if (!expect) return true;
+    var nav = performance.getEntriesByType("navigation")[0];
+    return !!nav && (nav.name === expect || performance.timeOrigin >= started);
+}
+function tick() {
+    if (Date.now() >= deadline) {
+        done(null);
+        return;
+    }
+    if (location.href !== last) {
+        last = location.href;
+        since = Date.now();
+    }
+    if (fresh() && order[document.readyState] >= order[want] && Date.now() - since >= settle) {
+        var nav = performance.getEntriesByType("navigation")[0];
+        var entries = performance.getEntriesByType("resource").concat(nav ? [nav] : []);
+        var report = {ready_state: document.readyState, url: location.href, page_time: nav ? nav.duration / 1000 : null,
+                      bytes: 0, requests: entries.length, cached: 0, unmeasured: 0};
+        entries.forEach(function(entry) {
+            report.bytes += entry.transferSize || 0;
+            // Zero transferred with a body is a cache hit, zero with no sizes at all is cross-origin without
+            // Timing-Allow-Origin, whose size the page cannot see
+            if (!entry.transferSize && entry.decodedBodySize) report.cached++;
+            else if (!entry.transferSize && !entry.decodedBodySize) report.unmeasured++;
+        });
+        done(report);
+        return;
+    }
+    setTimeout(tick, 25);
+}
+tick();
+"""
 
 # Symbolic Type Classes
 class Label:
+    __slots__ = ("_name",)
+
     def __init__(self, name):
         self._name = name
 
@@ -22,6 +138,8 @@ class Label:
 
 
 class Matcher:
+    __slots__ = ("_by", "_value", "_matches")
+
     def __init__(self, by, value):
         self._by = by
         self._value = value
@@ -49,10 +167,13 @@ class Matcher:
 
 
 class Element:
-    def __init__(self, element, label=None, match=None):
+    __slots__ = ("element", "_label", "_match", "which")
+
+    def __init__(self, element, label=None, match=None, which="only"):
         self.element = element
         self._label = Label(label) if label else None
         self._match = Matcher(*match) if match else None
+        self.which = which  # find strategy used to pick element, reused when healing
 
     def __repr__(self):
         return f"<SymbolicElement label={self._label}>"
@@ -84,14 +205,50 @@ class PySBK(SeleniumBrowser):
         super().__init__(*args, **kwargs)
         self.log.debug("Initializing PySBK")
 
-        strategies = load_strategies()
-        self.find_strategies = strategies.get("find_strategies", {})
-        self.click_behaviors = strategies.get("click_behaviors", {})
-        self.type_modes = strategies.get("type_modes", {})
-        self.expect_conditions = strategies.get("expect_conditions", {})
-        self.go_behaviors = strategies.get("go_behaviors", {})
+        self.bind_strategies(load_strategies())
+
+        self.registry = ElementRegistry(self.registry_size, self.registry_ttl)
+        self.find_cache = FindCache() if self.find_cache else None
+        self.load_baselines = {}  # url -> bytes and page time of the last full load
+        self.pool = kwargs.get("pool")  # optional DriverPool to borrow sessions from
+        self.leased = None
+
+    # Dispatch tables are bound as per-instance copies of the process-wide registry
+    def bind_strategies(self, strategies):
+        for name in STRATEGY_TABLES:
+            setattr(self, name, dict(strategies[name]))
+        self.pick_first = self.find_strategies.get("first", lambda els: els[0])
+
+    def reload_strategies(self):
+        self.bind_strategies(strategy_registry.reload())
+
+    # Pooled sessions
+    def borrow(self, name=None, timeout=None):
+        if not self.pool:
+            raise RuntimeError("PySBK was not given a DriverPool")
+        if self.leased:
+            self.release()
+        name = name or self.browser
+        self.driver, self.window = self.pool.checkout(name, timeout), None
+        if self.profiler:
+            self.profiler.instrument_driver(self.driver)
+        self.leased = name
+        return self.driver
+
+    def release(self):
+        if self.pool and self.leased:
+            self.pool.checkin(self.leased, self.driver)
+        self.driver, self.window = None, None
+        self.leased = None
+        self.registry.clear()
+
+    def __enter__(self):
+        if self.pool and not self.leased:
+            self.borrow()
+        return self
 
-        self.registry = {}
+    def __exit__(self, *exc):
+        self.release()
 
     # Symbolic resolution
     def resolve(self, target=None, which="only", by=None, match=None):
@@ -100,7 +257,7 @@ class PySBK(SeleniumBrowser):
 
         if isinstance(target, Label):
             el = self.registry.get(target.name)
-            return el.element if el else None
+            return el.element if el is not None else None
 
         if isinstance(target, Matcher):
             elements = self.driver.find_elements(target._by, target._value)
@@ -108,36 +265,123 @@ class PySBK(SeleniumBrowser):
             return elements[0] if which == "only" else elements[which]
 
         if by and match:
-            return self.find(by, match, which).element
+            found = self.find(by, match, which)
+            return found.element if found else None
 
         return None
 
     # Registry access
-    def register(self, label, element):
-        self.registry[label] = element
+    def register(self, label, element, scope=None):
+        self.registry.put(label, element, scope or self.registry_scope)
         return element
 
     def get_label(self, name):
         return self.registry.get(name)
 
     # Element resolution
-    def find(self, by, match, which="only", label=None):
-        elements = self.driver.find_elements(by, match)
+    def find(self, by, match, which="only", label=None, scope=None):
+        if self.find_cache is not None:
+            elements = self.find_cached(by, match)
+        else:
+            elements = self.driver.find_elements(by, match)
+        return self.bind(by, match, elements, which, label, scope)
+
+    # Cache lookups are validated against the URL and the agent's DOM generation in one round trip
+    def find_cached(self, by, match):
+        cache = self.find_cache
+        cached = cache.get(by, match)
+        url, gen = cache.state
+        url, gen, elements = self.driver.execute_script(
+            FIND_CACHED_JS, by, match, url, gen if cached is not None else None, by in BATCH_LOCATORS
+        )
+        if gen is None:
+            # No DOM agent on this page, nothing to validate against
+            cache.miss()
+            return elements if elements is not None else self.driver.find_elements(by, match)
+        if cache.observe(url, gen) and cached is not None and elements is None:
+            cache.hit()
+            return cached
+        cache.miss()
+        if elements is None:
+            elements = self.driver.find_elements(by, match)
+        cache.put(by, match, elements)
+        return elements
+
+    def find_many(self, specs):
+        specs = [tuple(spec) + ("only", None)[len(spec) - 2:] for spec in specs]
+        batched = [i for i, spec in enumerate(specs) if spec[0] in BATCH_LOCATORS]
+
+        found = {}
+        if batched:
+            try:
+                results = self.driver.execute_script(FIND_MANY_JS, [[specs[i][0], specs[i][1]] for i in batched])
+                found = {i: elements for i, elements in zip(batched, results) if elements is not None}
+            except Exception as e:
+                self.log.debug(f"Batched find failed, falling back: {e}")
+
+        symbolic = []
+        for i, (by, match, which, label) in enumerate(specs):
+            elements = found[i] if i in found else self.driver.find_elements(by, match)
+            symbolic.append(self.bind(by, match, elements, which, label))
+        return symbolic
+
+    def bind(self, by, match, elements, which="only", label=None, scope=None):
         if not elements:
             self.last_error = Exception("No elements found")
             return None
 
-        matcher = Matcher(by, match)
-        matcher.matches = elements
+        el = self.pick(elements, which)
+        symbolic = Element(el, label=label, match=(by, match), which=which)
+        symbolic._match.matches = list(elements)
+        if label:
+            self.register(label, symbolic, scope)
+        return symbolic
 
-        el = elements[0] if which == "only" else (
-            elements[which] if isinstance(which, int) else self.find_strategies.get(which, lambda x: x[0])(elements)
+    def pick(self, elements, which="only"):
+        return elements[0] if which == "only" else (
+            elements[which] if isinstance(which, int) else self.find_strategies.get(which, self.pick_first)(elements)
         )
 
-        symbolic = Element(el, label=label, match=(by, match))
-        if label:
-            self.register(label, symbolic)
-        return symbolic
+    # Re-resolves a stale handle through its Matcher, in place
+    def heal(self, symbolic):
+        matcher = symbolic._match
+        if matcher is None:
+            return None
+        elements = self.driver.find_elements(matcher._by, matcher._value)
+        if not elements:
+            return None
+        # The re-rendered list may be shorter, and strategies such as "all" or "second" need not yield one element
+        try:
+            picked = self.pick(elements, self.heal_strategy or symbolic.which)
+        except IndexError as e:
+            picked, self.last_error = None, e
+        if picked is None or isinstance(picked, (list, tuple)):
+            self.log.debug(f"Could not heal {matcher}, no single element for '{symbolic.which}'")
+            return None
+        symbolic.element = picked
+        matcher.matches = elements
+        if self.find_cache is not None:
+            self.find_cache.invalidate()
+        self.log.debug(f"Healed stale element {matcher}")
+        return symbolic.element
+
+    # Runs action on the resolved element, retrying through heal() when the handle went stale
+    def act(self, target, action=None, **kwargs):
+        el = self.resolve(target=target, **kwargs)
+        if el is None or action is None:
+            return el, None
+        symbolic = self.registry.get(target.name) if isinstance(target, Label) else target
+        for attempt in range(self.heal_retries + 1):
+            try:
+                return el, action(el)
+            except StaleElementReferenceException as e:
+                self.last_error = e
+                if attempt == self.heal_retries:
+                    break
+                el = self.heal(symbolic) if isinstance(symbolic, Element) else self.resolve(target=target, **kwargs)
+                if el is None:
+                    break
+        return None, None
 
     # Condition builder
     def expect(self, by, match, condition="present", value=False, mode="partial"):
@@ -152,13 +396,109 @@ class PySBK(SeleniumBrowser):
             return None
 
     # Wait wrapper
-    def wait(self, condition, timeout=None):
+    def wait(self, condition, timeout=None, backend=None, cancel=None):
+        backend = backend or self.wait_backend
+        if hasattr(condition, "spec"):
+            if backend == "observer" and condition.observable:
+                result = self.observe([condition], timeout, cancel=cancel)
+                return result["hits"][0] if result else None
+            condition = self.poller(condition)
+        if cancel:
+            condition = cancellable(condition, cancel)
         try:
             return WebDriverWait(self.driver, timeout or self.timeout).until(condition)
         except Exception as e:
             self.last_error = e
             return None
 
+    def wait_for(self, by, match, condition="present", value=False, mode="partial", timeout=None, backend=None, cancel=None):
+        return self.wait(Condition(by, match, condition, value, mode), timeout, backend, cancel)
+
+    # Composite waits, every condition is checked in one batched evaluation per tick
+    def wait_any(self, *conditions, timeout=None, backend=None, cancel=None):
+        result = self.wait_many(conditions, "any", timeout, backend, cancel)
+        return (result["index"], result["hits"][result["index"]]) if result else None
+
+    def wait_all(self, *conditions, timeout=None, backend=None, cancel=None):
+        result = self.wait_many(conditions, "all", timeout, backend, cancel)
+        return result["hits"] if result else None
+
+    def wait_many(self, conditions, mode="all", timeout=None, backend=None, cancel=None):
+        # Anything exposing spec() and key is a condition, tuples are (by, match, condition, ...)
+        conditions = [c if hasattr(c, "spec") else Condition(*c) for c in conditions]
+        backend = backend or self.wait_backend
+        if all(c.observable for c in conditions):
+            if backend == "observer":
+                return self.observe(conditions, timeout, mode, cancel)
+            specs = [c.spec() for c in conditions]
+            tick = lambda driver: driver.execute_async_script(OBSERVE_JS, specs, mode, 0)
+        else:
+            pollers = [self.poller(c) for c in conditions]
+            tick = lambda driver: self.check_many(driver, pollers, mode)
+        return self.wait(tick, timeout, cancel=cancel)
+
+    def check_many(self, driver, pollers, mode="all"):
+        hits = []
+        for poller in pollers:
+            try:
+                hits.append(poller(driver) or None)
+            except Exception:
+                hits.append(None)
+        if mode == "any":
+            index = next((i for i, hit in enumerate(hits) if hit is not None), None)
+            return {"index": index, "hits": hits} if index is not None else None
+        return {"index": -1, "hits": hits} if all(hit is not None for hit in hits) else None
+
+    # Polling predicate for a Condition, built from expect_conditions
+    def poller(self, condition):
+        key = condition.key
+        resolver = self.expect_conditions.get(key)
+        if not resolver:
+            raise Exception(f"Unknown condition: {condition.condition}")
+        by, match, value = condition.by, condition.match, condition.value
+        if "text" in key:
+            return lambda driver: resolver(driver, by, match, value)
+        if key == "value":
+            return resolver(by, match, value)
+        if key == "alert":
+            return resolver()
+        if key == "stale":
+            return resolver(match)
+        return resolver(by, match)
+
+    # MutationObserver backed wait, resolves in-page the moment the conditions hold
+    def observe(self, conditions, timeout=None, mode="all", cancel=None):
+        timeout = self.timeout if timeout is None else timeout
+        with self.script_timeout(timeout + 5) as set_timeout:
+            return self.observe_slices(conditions, timeout, mode, cancel, set_timeout)
+
+    def observe_slices(self, conditions, timeout, mode, cancel, set_timeout):
+        deadline = time.monotonic() + timeout
+        specs = [c.spec() for c in conditions]
+        while True:
+            remaining = deadline - time.monotonic()
+            if cancel and cancel.is_set():
+                self.last_error = WaitCancelled(f"Wait cancelled: {conditions}")
+                return None
+            if remaining <= 0:
+                self.last_error = TimeoutError(f"Conditions not met within {timeout}s: {conditions}")
+                return None
+            # Cancellable waits observe in short slices so the cancel flag is seen promptly
+            window = min(remaining, OBSERVE_SLICE) if cancel else remaining
+            set_timeout(window + 5)
+            try:
+                result = self.driver.execute_async_script(OBSERVE_JS, specs, mode, int(window * 1000))
+            except Exception as e:
+                self.last_error = e
+                if not document_unloaded(e):
+                    self.log.error(f"Observer wait failed: {e}")
+                    return None
+                # Navigation tore down the observer, re-arm it on the new document
+                time.sleep(0.05)
+                continue
+            if result is not None:
+                return result
+
     # Semantic aliases
     def alertPresent(self): return self.expect(None, None, "alert")
     def console(self, namespace="_PySBK"): return self.get_console_logs(namespace)
@@ -175,35 +515,153 @@ class PySBK(SeleniumBrowser):
 
     # Action methods
     def click(self, target=None, behavior="default", **kwargs):
-        el = self.resolve(target=target, **kwargs)
-        if el and behavior in self.click_behaviors:
-            self.click_behaviors[behavior](el)
+        el, _ = self.act(target, self.click_behaviors.get(behavior), **kwargs)
         return Element(el) if el else None
 
     def get_text(self, target=None, **kwargs):
-        el = self.resolve(target=target, **kwargs)
-        return el.text.strip() if el else None
+        _, text = self.act(target, lambda el: el.text.strip(), **kwargs)
+        return text
 
     def get_attribute(self, attr, target=None, **kwargs):
-        el = self.resolve(target=target, **kwargs)
-        return el.get_attribute(attr) if el else None
+        _, value = self.act(target, lambda el: el.get_attribute(attr), **kwargs)
+        return value
+
+    def extract(self, target, fields=("text",), rows=False):
+        fields = [fields] if isinstance(fields, str) else list(fields)
+        if isinstance(target, Label):
+            target = self.registry.get(target.name)
 
-    def go(self, url, reinject=True, track_redirects=True, behavior="default"):
+        if isinstance(target, Matcher):
+            target.matches = self.driver.find_elements(target._by, target._value)
+            elements = target.matches
+        elif isinstance(target, Element):
+            elements = target.matches or [target.element]
+        else:
+            elements = list(target or [])
+
+        columns = {f: [] for f in fields}
+        if elements:
+            try:
+                columns = self.driver.execute_script(EXTRACT_JS, elements, fields)
+            except Exception as e:
+                self.last_error = e
+                return None
+
+        if rows:
+            return (dict(zip(fields, row)) for row in zip(*(columns[f] for f in fields)))
+        return columns
+
+    def go(self, url, reinject=True, track_redirects=True, behavior="default", timeout=None, settle=None, profile=None):
+        start, started = time.monotonic(), time.time() * 1000
+        persistent = reinject and self.register_scripts()
+        profile = profile or (behavior if behavior in self.load_profiles else self.load_profile)
+        if active_profiles.get(self.driver.session_id, "full") != profile:
+            self.apply_load_profile(profile)
         if behavior in self.go_behaviors:
             self.go_behaviors[behavior](self.driver, url)
+        self.last_navigation = {"url": url, "profile": profile, "ready_state": None, "page_time": None}
+        if self.find_cache is not None:
+            self.find_cache.invalidate()
+        self.registry.new_page()
 
         if track_redirects:
-            time.sleep(1)
-            final_url = self.driver.current_url
-            if final_url != url:
+            final_url = self.wait_for_navigation(timeout, settle, url, started)
+            if final_url and final_url != url:
                 self.last_redirect = final_url
+            self.record_load(url, profile)
+
+        self.last_navigation["elapsed"] = time.monotonic() - start
+        session_origins.setdefault(self.driver.session_id, set()).update(
+            {url_origin(url), url_origin(self.last_navigation["url"])} - {None}
+        )
+        self.log.debug(f"Navigated to {self.last_navigation['url']} in {self.last_navigation['elapsed']:.3f}s")
 
-        if reinject:
+        if reinject and not persistent:
             self.track()
             self.inject_dom_agent()
 
+    # Full loads become the baseline the savings of lighter profiles are measured against
+    def record_load(self, url, profile):
+        nav = self.last_navigation
+        if nav.get("bytes") is None:
+            return
+        # Cache hits transfer nothing, so only cold loads make a baseline or a comparison
+        cold = not nav["cached"]
+        if profile == "full":
+            if cold:
+                self.load_baselines[url] = {key: nav[key] for key in ("bytes", "page_time", "unmeasured")}
+            return
+        base = self.load_baselines.get(url)
+        if not base or not cold:
+            self.log.debug(f"No cold baseline or cold load to compare profile '{profile}' on {url}")
+            return
+        nav["saved_bytes"] = base["bytes"] - nav["bytes"]
+        if base["page_time"] is not None and nav["page_time"] is not None:
+            nav["saved_time"] = base["page_time"] - nav["page_time"]
+        # Blocked third parties are mostly unmeasured, their bytes are missing from the baseline
+        nav["savings_exact"] = not base["unmeasured"] and not nav["unmeasured"]
+        self.log.debug(f"Profile '{profile}' saved {nav['saved_bytes']} bytes on {url}")
+
+    # Navigation completion, resolves once the document is ready and the URL held still for settle seconds
+    def wait_for_navigation(self, timeout=None, settle=None, url=None, started=None):
+        timeout = self.timeout if timeout is None else timeout
+        settle = self.nav_settle if settle is None else settle
+        ready = "complete" if self.page_load_strategy == "normal" else "interactive"
+        deadline = time.monotonic() + timeout
+        # Only page_load_strategy none returns before the new document replaced the old one
+        expect = url if self.page_load_strategy == "none" else None
+        started = time.time() * 1000 if started is None else started
+
+        with self.script_timeout(timeout + 5):
+            while True:
+                remaining = max(0.0, deadline - time.monotonic())
+                try:
+                    report = self.driver.execute_async_script(
+                        NAV_SETTLE_JS, ready, int(settle * 1000), int(remaining * 1000), expect, started
+                    )
+                except Exception as e:
+                    # The document unloaded mid-script (client side redirect), measure the next one
+                    if time.monotonic() >= deadline:
+                        self.last_error = e
+                        self.log.error(f"Navigation did not settle within {timeout}s: {e}")
+                        return None
+                    time.sleep(0.05)
+                    continue
+                if report is None:
+                    self.last_error = TimeoutError(f"Navigation did not settle within {timeout}s")
+                    self.log.error(str(self.last_error))
+                    return None
+                self.last_navigation.update(report)
+                return report["url"]
+
+    # Raises the session's async script timeout for a block and restores the previous value after,
+    # the yielded setter adjusts it within the block; a timeout already long enough is left alone.
+    # The value is read from the driver once per session and cached, scripts bound their own waits
+    @contextmanager
+    def script_timeout(self, seconds):
+        session = self.driver.session_id
+        if session not in script_timeouts:
+            script_timeouts[session] = self.driver.timeouts.script
+        previous = script_timeouts[session]
+
+        def set_timeout(value):
+            current = script_timeouts[session]
+            if current is None or value > current:
+                self.driver.set_script_timeout(value)
+                script_timeouts[session] = value
+
+        set_timeout(seconds)
+        try:
+            yield set_timeout
+        finally:
+            if script_timeouts[session] != previous and previous is not None:
+                self.driver.set_script_timeout(previous)
+                script_timeouts[session] = previous
+
     def type(self, text, target=None, mode="default", term="", **kwargs):
-        el = self.resolve(target=target, **kwargs)
-        if el and mode in self.type_modes:
-            self.type_modes[mode](el, text) if mode != "type_then_term" else self.type_modes[mode](el, text, term)
+        typer = self.type_modes.get(mode)
+        action = None if not typer else (
+            (lambda el: typer(el, text)) if mode != "type_then_term" else (lambda el: typer(el, text, term))
+        )
+        el, _ = self.act(target, action, **kwargs)
         return Element(el) if el else None
@@ -1,48 +1,202 @@
-import shutil, subprocess
+import os, shutil, subprocess, time
 
 try:
     from selenium import webdriver
-    from selenium.webdriver.common.by import By
-    from selenium.webdriver.common.keys import Keys    
-    from selenium.webdriver.support.ui import WebDriverWait
-    from selenium.webdriver.support import expected_conditions as EC
-    from webdriver_manager.chrome import ChromeDriverManager
-    from webdriver_manager.firefox import GeckoDriverManager
-    from webdriver_manager.microsoft import EdgeChromiumDriverManager
 except Exception as e:
     print(f'[SeleniumBrowser] Import error: {e}')
 
-import runtime
+from . import runtime
+from .profiling import Profiler
+
+TRACKER_PATH = "assets/tracker.js"
+
+DOM_AGENT_JS = """
+window._PySBK = window._PySBK || {};
+window._PySBK.dom = {
+    log: function(msg) {
+        console.log("[_PySBK] " + msg);
+    },
+    getAllInputs: function() {
+        return Array.from(document.querySelectorAll("input")).map(i => i.name || i.id);
+    }
+};
+if (window._PySBK.gen === undefined) {
+    // DOM generation, bumped on every mutation batch so cached lookups validate cheaply,
+    // doc tells a reloaded document at the same URL apart from the previous one
+    window._PySBK.doc = Date.now().toString(36) + Math.random().toString(36).slice(2);
+    window._PySBK.gen = 0;
+    new MutationObserver(function() { window._PySBK.gen++; }).observe(document, {
+        subtree: true, childList: true, attributes: true, characterData: true
+    });
+}
+if (!window._PySBK.events) {
+    // Console ring buffer drained by cursor, epoch changes with every new document
+    window._PySBK.events = (function() {
+        var cap = 2000, buf = new Array(cap), seq = 0;
+        var epoch = Date.now().toString(36) + Math.random().toString(36).slice(2);
+        function push(level, message) {
+            buf[seq % cap] = {seq: seq, ts: Date.now(), level: level, message: message};
+            seq++;
+        }
+        function since(fromEpoch, cursor, ns, levels, limit) {
+            if (fromEpoch !== epoch) cursor = 0;
+            var start = Math.max(cursor, seq - cap), out = [], i = start;
+            for (; i < seq && out.length < limit; i++) {
+                var e = buf[i % cap];
+                if (ns && e.message.indexOf(ns) === -1) continue;
+                if (levels && levels.indexOf(e.level) === -1) continue;
+                out.push(e);
+            }
+            return {epoch: epoch, cursor: i, dropped: start - cursor, entries: out};
+        }
+        ["debug", "log", "info", "warn", "error"].forEach(function(level) {
+            var original = console[level];
+            console[level] = function() {
+                try {
+                    push(level, Array.prototype.map.call(arguments, String).join(" "));
+                } catch (e) {}
+                return original.apply(console, arguments);
+            };
+        });
+        return {push: push, since: since};
+    })();
+}
+"""
+
+DRAIN_EVENTS_JS = """
+var events = window._PySBK && window._PySBK.events;
+return events ? events.since(arguments[0], arguments[1], arguments[2], arguments[3], arguments[4]) : null;
+"""
+
+SNAPSHOT_STORAGE_JS = """
+// Storage getters throw on opaque origins such as data:, and about:blank
+function dump(name) {
+    var out = {};
+    try {
+        var store = window[name];
+        for (var i = 0; i < store.length; i++) out[store.key(i)] = store.getItem(store.key(i));
+    } catch (e) {}
+    return out;
+}
+return {url: location.href, origin: location.origin, local: dump("localStorage"), session: dump("sessionStorage")};
+"""
+
+RESTORE_STORAGE_JS = """
+// Storage belongs to the snapshot's origin, any other page gets none of it
+if (arguments[2] && location.origin !== arguments[2]) return null;
+var count = 0;
+[["localStorage", arguments[0]], ["sessionStorage", arguments[1]]].forEach(function(pair) {
+    try {
+        var store = window[pair[0]];
+        Object.keys(pair[1] || {}).forEach(function(key) {
+            try { store.setItem(key, pair[1][key]); count++; } catch (e) {}
+        });
+    } catch (e) {}
+});
+return count;
+"""
+
+# Network.setCookies accepts only these fields of a Network.getAllCookies entry
+CDP_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires", "priority", "partitionKey")
+
+# Load profile applied per session id, shared by every instance and pool handling that session
+active_profiles = {}
+
+# Async script timeout per session id as last set or read, saves a GET /timeouts per wait
+script_timeouts = {}
+
+# Origins navigated to per session id, cleared by DriverPool.reset() between leases
+session_origins = {}
+
+# Window handles per session id whose scripts are registered through Page.addScriptToEvaluateOnNewDocument
+registered_sessions = {}
+
+
+# Drops everything kept per session id once the session has quit
+def forget_session(session_id):
+    for state in (active_profiles, script_timeouts, session_origins, registered_sessions):
+        state.pop(session_id, None)
+
+def executor_url(driver):
+    executor = getattr(driver, "command_executor", None)
+    config = getattr(executor, "client_config", None)
+    return getattr(config, "remote_server_addr", None) or getattr(executor, "_url", None)
+
+
+# Remote driver bound to an existing session id instead of starting a new one
+def attach_driver(executor, session_id):
+    class AttachedDriver(webdriver.Remote):
+        def start_session(self, capabilities):
+            self.session_id = session_id
+            self.caps = capabilities
+
+    return AttachedDriver(command_executor=executor, options=webdriver.ChromeOptions())
+
 
 class SeleniumBrowser:
     def __init__(self, **kwargs):
         self.log = runtime.setup_logger()
         self.log.info("Initializing SeleniumBrowser")
-        config = load_config()
+        config = runtime.load_user_config()
         PARAMS = {
             "browser": "chromium",
             "clone": "true",
+            "clone_dir": None,
+            "clone_method": "auto",
+            "detect": "lazy",
+            "find_cache": "false",
             "headless": "false",
+            "heal_retries": 2,
+            "heal_strategy": None,
+            "instrument": "false",
+            "load_profile": "full",
+            "nav_settle": 0.25,
+            "page_load_strategy": "normal",
             "profile": None,
+            "registry_scope": "session",
+            "registry_size": 1024,
+            "registry_ttl": 0.0,
+            "timeout": 10.0,
+            "wait_backend": "poll",
             "URL": None,
         }
         for key, default in PARAMS.items():
             raw_value = kwargs.get(key, config.get(key, default))
             if isinstance(default, str) and default in ("true", "false"):
-                resolved = raw_value == "true"
+                resolved = raw_value in (True, "true")
+            elif isinstance(default, (int, float)):
+                resolved = type(default)(raw_value)
             else:
                 resolved = raw_value
+            setattr(self, key.lower(), resolved)
         self.browsers = {}  # registry of all detected browsers
-        self.detect_browsers()
+        self.driver = None  # active session, launched or borrowed from a pool
+        self.window = None  # (session id, window handle) the driver is on, kept by switch_window()/new_window()
+        self.last_error = None
+        self.event_cursor = {"epoch": None, "seq": 0}
+        self.clones = {}  # session id -> cloned profile directory, removed when the session stops
+        self.stale_templates = set()  # browsers whose profile template is re-snapshotted on next clone
+        self.profiler = kwargs.get("profiler") or (Profiler() if self.instrument else None)
+        if self.profiler:
+            self.profiler.instrument(self)
+        self.detection_cache = runtime.load_detection_cache()
+        if self.detect == "eager":
+            self.detect_browsers()
+        else:
+            self.locate_browsers()
 
-    def build_options(self, name, binary, profile_path, user_data_dir):
+    def build_options(self, name, binary, profile_path, user_data_dir, clone=None):
         if name in ["brave", "chrome", "chromium"]:
             options = webdriver.ChromeOptions()
+            options.page_load_strategy = self.page_load_strategy
             options.binary_location = binary
             if self.headless:
                 options.add_argument("--headless=new")
-            options.add_argument(f"--user-data-dir={user_data_dir}")
-            options.add_argument(f"--profile-directory={profile_path}")
+            if clone:
+                options.add_argument(f"--user-data-dir={clone}")
+            else:
+                options.add_argument(f"--user-data-dir={user_data_dir}")
+                options.add_argument(f"--profile-directory={profile_path}")
             options.add_argument("--disable-infobars")
             options.add_argument("--disable-extensions")
             options.add_argument("--no-sandbox")
@@ -51,33 +205,64 @@ class SeleniumBrowser:
 
         elif name == "edge":
             options = webdriver.EdgeOptions()
+            options.page_load_strategy = self.page_load_strategy
             if self.headless:
                 options.add_argument("--headless")
-            options.add_argument(f"--user-data-dir={user_data_dir}")
-            options.add_argument(f"--profile-directory={profile_path}")
+            if clone:
+                options.add_argument(f"--user-data-dir={clone}")
+            else:
+                options.add_argument(f"--user-data-dir={user_data_dir}")
+                options.add_argument(f"--profile-directory={profile_path}")
             return options
 
         elif name == "firefox":
             options = webdriver.FirefoxOptions()
+            options.page_load_strategy = self.page_load_strategy
             if self.headless:
                 options.add_argument("--headless")
+            if clone:
+                options.add_argument("-profile")
+                options.add_argument(clone)
+            for pref, value in runtime.profile_prefs(self.profile_spec(self.load_profile)).items():
+                options.set_preference(pref, value)
             return options
 
         return None
 
-    def build_service(self, name):
+    def build_service(self, name, driver_path=None):
         try:
+            driver_path = driver_path or self.resolve_driver_path(name)
+            if not driver_path:
+                return None
             if name in ["brave", "chrome", "chromium"]:
-                return webdriver.Chrome.service.Service(ChromeDriverManager().install())
+                return webdriver.chrome.service.Service(driver_path)
             elif name == "edge":
-                return webdriver.Edge.service.Service(EdgeChromiumDriverManager().install())
+                return webdriver.edge.service.Service(driver_path)
             elif name == "firefox":
-                return webdriver.Firefox.service.Service(GeckoDriverManager().install())
+                return webdriver.firefox.service.Service(driver_path)
         except Exception as e:
             print(f"[SeleniumBrowser] Failed to build service for {name}: {e}")
             return None
 
+    # Driver managers are imported only for the browser being resolved
+    def resolve_driver_path(self, name):
+        if name in ["brave", "chrome", "chromium"]:
+            from webdriver_manager.chrome import ChromeDriverManager
+            return ChromeDriverManager().install()
+        elif name == "edge":
+            from webdriver_manager.microsoft import EdgeChromiumDriverManager
+            return EdgeChromiumDriverManager().install()
+        elif name == "firefox":
+            from webdriver_manager.firefox import GeckoDriverManager
+            return GeckoDriverManager().install()
+        return None
+
     def detect_browsers(self):
+        self.locate_browsers()
+        for name in list(self.browsers):
+            self.resolve_browser(name)
+
+    def locate_browsers(self):
         candidates = {
             "brave": ["brave-browser", "brave"],
             "chrome": ["google-chrome", "chrome"],
@@ -90,24 +275,57 @@ class SeleniumBrowser:
             for binary in binaries:
                 path = shutil.which(binary)
                 if path:
-                    version = self.get_browser_version(path)
                     profile_path, user_data_dir = runtime.resolve_profile(name)
-                    options = self.build_options(name, path, profile_path, user_data_dir)
-                    service = self.build_service(name)
                     self.browsers[name] = {
                         "name": name,
                         "binary": path,
-                        "version": version,
+                        "version": None,
                         "profile_path": profile_path,
                         "user_data_dir": user_data_dir,
-                        "options": options,
-                        "service": service,
+                        "options": None,
+                        "service": None,
+                        "driver_path": None,
                         "driver": None,
                         "process": None,
-                        "status": "idle"
+                        "status": "idle",
+                        "resolved": False
                     }
                     break  # stop after first valid binary
 
+    def resolve_browser(self, name):
+        browser = self.browsers.get(name)
+        if not browser:
+            return None
+        if browser["resolved"]:
+            return browser
+
+        # Version and driver path are cached on disk per binary path and mtime
+        key = runtime.binary_key(browser["binary"])
+        cached = self.detection_cache.get(key, {})
+        version = cached.get("version") or self.get_browser_version(browser["binary"])
+        driver_path = cached.get("driver_path")
+        if not driver_path or not os.path.exists(driver_path):
+            try:
+                driver_path = self.resolve_driver_path(name)
+            except Exception as e:
+                print(f"[SeleniumBrowser] Failed to resolve driver for {name}: {e}")
+                driver_path = None
+
+        if driver_path and (cached.get("version"), cached.get("driver_path")) != (version, driver_path):
+            self.detection_cache = {
+                k: v for k, v in self.detection_cache.items()
+                if not k.startswith(f"{browser['binary']}:")
+            }
+            self.detection_cache[key] = {"name": name, "version": version, "driver_path": driver_path}
+            runtime.save_detection_cache(self.detection_cache)
+
+        browser["version"] = version
+        browser["options"] = self.build_options(name, browser["binary"], browser["profile_path"], browser["user_data_dir"])
+        browser["driver_path"] = driver_path
+        browser["service"] = self.build_service(name, driver_path)
+        browser["resolved"] = True
+        return browser
+
     def get_browser_version(self, binary):
         try:
             result = subprocess.run([binary, "--version"], capture_output=True, text=True)
@@ -123,19 +341,31 @@ class SeleniumBrowser:
             self.log.error(f"Console log retrieval failed: {e}")
             return []
 
+    # Cursor based reads of the DOM agent's console ring buffer
+    def drain_events(self, namespace="_PySBK", levels=None, limit=500):
+        cursor = self.event_cursor
+        try:
+            batch = self.driver.execute_script(DRAIN_EVENTS_JS, cursor["epoch"], cursor["seq"], namespace, levels, limit)
+        except Exception as e:
+            self.log.error(f"Event drain failed: {e}")
+            return []
+        if not batch:
+            return []
+        if batch["dropped"]:
+            self.log.warning(f"Event buffer overran, {batch['dropped']} entries dropped")
+        cursor["epoch"], cursor["seq"] = batch["epoch"], batch["cursor"]
+        return batch["entries"]
+
+    def stream_events(self, namespace="_PySBK", levels=None, interval=0.25, timeout=None, limit=500):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while deadline is None or time.monotonic() < deadline:
+            entries = self.drain_events(namespace, levels, limit)
+            yield from entries
+            if len(entries) < limit:
+                time.sleep(interval)
+
     def inject_dom_agent(self):
-        agent_code = """
-        window._PySBK = window._PySBK || {};
-        window._PySBK.dom = {
-            log: function(msg) {
-                console.log("[_PySBK] " + msg);
-            },
-            getAllInputs: function() {
-                return Array.from(document.querySelectorAll("input")).map(i => i.name || i.id);
-            }
-        };
-        """
-        self.inject_script(agent_code)
+        self.inject_script(DOM_AGENT_JS)
 
     def inject_script(self, js_code):
         try:
@@ -146,37 +376,228 @@ class SeleniumBrowser:
             
     def inject_tracker(self):
         try:
-            with open("assets/tracker.js", "r") as f:
-                js_code = f.read()
+            js_code = runtime.read_asset(TRACKER_PATH)
             self.inject_script(js_code)
             self.log.debug("Injected PySBK tracker")
         except Exception as e:
             self.log.error(f"Tracker injection failed: {e}")
 
+    # Scripts evaluated on every new document of the session
+    def session_scripts(self):
+        scripts = []
+        try:
+            scripts.append(runtime.read_asset(TRACKER_PATH))
+        except OSError as e:
+            self.log.debug(f"Tracker unavailable: {e}")
+        scripts.append(DOM_AGENT_JS)
+        return scripts
+
+    def register_scripts(self):
+        if not hasattr(self.driver, "execute_cdp_cmd"):
+            return False  # no CDP, caller re-injects after each navigation
+        # Registration applies to the current target only, every window or tab needs its own
+        session_id = self.driver.session_id
+        if not self.window or self.window[0] != session_id:
+            self.window = (session_id, self.driver.current_window_handle)
+        handles = registered_sessions.setdefault(session_id, set())
+        if self.window[1] in handles:
+            return True
+        try:
+            for source in self.session_scripts():
+                self.driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+            handles.add(self.window[1])
+            self.log.debug("Registered PySBK scripts for new documents")
+            return True
+        except Exception as e:
+            self.log.error(f"Persistent script registration failed: {e}")
+            return False
+
+    # Session snapshots, login state survives relaunches without the real profile
+    def save_session(self, path=None, name=None):
+        path = path or runtime.session_path(name or self.browser)
+        try:
+            snapshot = self.driver.execute_script(SNAPSHOT_STORAGE_JS)
+            if hasattr(self.driver, "execute_cdp_cmd"):
+                snapshot["cookies"] = self.driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+                snapshot["cookie_source"] = "cdp"
+            else:
+                snapshot["cookies"] = self.driver.get_cookies()
+                snapshot["cookie_source"] = "webdriver"
+            snapshot["executor"] = executor_url(self.driver)
+            snapshot["session_id"] = self.driver.session_id
+            snapshot["saved"] = time.time()
+            runtime.save_snapshot(path, snapshot)
+            self.log.debug(f"Saved session with {len(snapshot['cookies'])} cookies to {path}")
+            return str(path)
+        except Exception as e:
+            self.log.error(f"Session save failed: {e}")
+            self.last_error = e
+            return None
+
+    def restore_session(self, path=None, name=None, navigate=True):
+        path = path or runtime.session_path(name or self.browser)
+        try:
+            snapshot = runtime.load_snapshot(path)
+            cookies = snapshot.get("cookies", [])
+            # CDP sets cookies for every domain before the first request, WebDriver only for the current one
+            via_cdp = snapshot.get("cookie_source") == "cdp" and hasattr(self.driver, "execute_cdp_cmd")
+            if via_cdp:
+                params = [{k: c[k] for k in CDP_COOKIE_FIELDS if k in c and not (k == "expires" and c.get("session"))}
+                          for c in cookies]
+                self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": params})
+            if navigate and snapshot.get("url", "").startswith("http"):
+                self.driver.get(snapshot["url"])
+            if not via_cdp:
+                for cookie in cookies:
+                    try:
+                        self.driver.add_cookie({k: v for k, v in cookie.items() if k != "sameSite" or v in ("Strict", "Lax", "None")})
+                    except Exception:
+                        pass  # cookie for another domain
+            restored = self.driver.execute_script(
+                RESTORE_STORAGE_JS, snapshot.get("local"), snapshot.get("session"), snapshot.get("origin")
+            )
+            if restored is None:
+                self.log.warning(f"Storage of {snapshot.get('origin')} not restored, the current page is another origin")
+                restored = 0
+            # Pages read storage and WebDriver-set cookies on load
+            if navigate and (restored or not via_cdp):
+                self.driver.refresh()
+            self.log.debug(f"Restored session from {path}: {len(cookies)} cookies, {restored} storage keys")
+            return True
+        except Exception as e:
+            self.log.error(f"Session restore failed: {e}")
+            self.last_error = e
+            return False
+
+    # Attach to a driver session that outlived the process that started it
+    def reattach(self, executor=None, session_id=None, path=None, name=None):
+        if not executor or not session_id:
+            try:
+                snapshot = runtime.load_snapshot(path or runtime.session_path(name or self.browser))
+                executor, session_id = snapshot["executor"], snapshot["session_id"]
+            except Exception as e:
+                self.log.error(f"No session to reattach: {e}")
+                self.last_error = e
+                return None
+        try:
+            driver = attach_driver(executor, session_id)
+            driver.current_url  # raises if the session is gone
+        except Exception as e:
+            self.log.error(f"Reattach to {session_id} at {executor} failed: {e}")
+            self.last_error = e
+            return None
+        if self.profiler:
+            self.profiler.instrument_driver(driver)
+        self.driver, self.window = driver, None
+        browser = self.browsers.get(name or self.browser)
+        if browser:
+            browser["driver"], browser["status"] = driver, "selenium"
+        self.log.info(f"Reattached to session {session_id}")
+        return driver
+
+    def driver_class(self, name):
+        if name in ["brave", "chrome", "chromium"]:
+            return webdriver.Chrome
+        return getattr(webdriver, name.capitalize())
+
+    def new_driver(self, name, mode="selenium"):
+        browser = self.resolve_browser(name)
+        if not browser:
+            raise ValueError(f"Browser '{name}' not available")
+        options = browser["options"]
+        clone = self.clone_profile(name) if self.clone else None
+        if clone or (mode == "headless" and not self.headless):
+            options = self.build_options(name, browser["binary"], browser["profile_path"], browser["user_data_dir"], clone)
+            if mode == "headless" and not self.headless:
+                options.add_argument("--headless=new")
+        # Each driver gets its own service so concurrent sessions don't share a process handle
+        service = self.build_service(name, browser["driver_path"])
+        try:
+            driver = self.driver_class(name)(service=service, options=options)
+        except Exception:
+            if clone:
+                shutil.rmtree(clone, ignore_errors=True)
+            raise
+        if clone:
+            self.clones[driver.session_id] = clone
+        if self.profiler:
+            self.profiler.instrument_driver(driver)
+        if self.load_profile != "full":
+            self.apply_load_profile(self.load_profile, driver)
+        return driver
+
+    # Profile clones, every session gets its own copy of a cached snapshot of the resolved profile
+    def clone_profile(self, name):
+        browser = self.browsers[name]
+        # Chromium-family profiles are cloned as a whole user data directory
+        source = browser["profile_path"]
+        try:
+            clone, method = runtime.clone_profile(
+                source, self.clone_method, self.clone_dir, prefix=f"pysbk-{name}-", refresh=name in self.stale_templates
+            )
+            self.stale_templates.discard(name)
+        except Exception as e:
+            # Falling back to the live profile would share it with its owner and every other session
+            self.log.error(f"Profile clone for {name} failed: {e}")
+            self.last_error = e
+            raise
+        self.log.debug(f"Cloned {name} profile into {clone} ({method})")
+        return clone
+
+    # Called once a session has quit, its clone and per-session state go with it
+    def discard_clone(self, driver):
+        session_id = getattr(driver, "session_id", None)
+        forget_session(session_id)
+        clone = self.clones.pop(session_id, None)
+        if clone:
+            shutil.rmtree(clone, ignore_errors=True)
+
+    # Load profiles, resource types and URL patterns blocked for a session or a navigation
+    def profile_spec(self, name):
+        profiles = getattr(self, "load_profiles", None) or runtime.load_strategies().get("load_profiles", {})
+        return profiles.get(name, {})
+
+    def apply_load_profile(self, name, driver=None):
+        driver = driver or self.driver
+        try:
+            applied = runtime.block_resources(driver, self.profile_spec(name))
+        except Exception as e:
+            self.log.error(f"Load profile '{name}' failed: {e}")
+            return False
+        if not applied:
+            self.log.debug(f"Load profile '{name}' needs CDP, session preferences apply instead")
+        active_profiles[driver.session_id] = name
+        return applied
+
+    # Windows, switching through these keeps self.window current without asking the driver before each go()
+    def switch_window(self, handle):
+        self.driver.switch_to.window(handle)
+        self.window = (self.driver.session_id, handle)
+
+    def new_window(self, kind="tab"):
+        self.driver.switch_to.new_window(kind)
+        self.window = (self.driver.session_id, self.driver.current_window_handle)
+        return self.window[1]
+
     def launch_browser(self, name, mode="selenium"):
         if name not in self.browsers:
             print(f"[SeleniumBrowser] Browser '{name}' not available.")
             return
 
-        browser = self.browsers[name]
+        browser = self.resolve_browser(name)
 
         # Stop any existing session
-        if browser["status"] == "selenium" and browser["driver"]:
+        if browser["status"] in ("selenium", "headless") and browser["driver"]:
             browser["driver"].quit()
+            self.discard_clone(browser["driver"])
         elif browser["status"] == "subprocess" and browser["process"]:
             browser["process"].terminate()
 
         try:
-            if mode == "selenium":
-                driver_class = getattr(webdriver, name.capitalize()) if name != "chromium" else webdriver.Chrome
-                browser["driver"] = driver_class(service=browser["service"], options=browser["options"])
-                browser["status"] = "selenium"
-
-            elif mode == "headless":
-                browser["options"].add_argument("--headless=new")
-                driver_class = getattr(webdriver, name.capitalize()) if name != "chromium" else webdriver.Chrome
-                browser["driver"] = driver_class(service=browser["service"], options=browser["options"])
-                browser["status"] = "headless"
+            if mode in ("selenium", "headless"):
+                browser["driver"] = self.new_driver(name, mode)
+                browser["status"] = mode
+                self.driver = browser["driver"]
 
             elif mode == "subprocess":
                 browser["process"] = subprocess.Popen([browser["binary"]])
@@ -187,20 +608,30 @@ class SeleniumBrowser:
             browser["status"] = "error"
             self.last_error = e
 
-    def resume_selenium(self, name):
+    def resume_selenium(self, name, restore=True):
+        saved = None
+        if restore and self.driver and self.browsers.get(name, {}).get("driver") is self.driver:
+            saved = self.save_session(name=name)
         self.stop_browser(name)
         self.launch_browser(name, mode="selenium")
+        if saved and self.driver:
+            self.restore_session(saved)
 
     def run_manual_auth(self, name):
         self.stop_browser(name)
         self.launch_browser(name, mode="subprocess")
+        # The login lands in the live profile, clones need a fresh snapshot of it
+        self.stale_templates.add(name)
 
     def stop_browser(self, name):
         if name not in self.browsers:
             return
         browser = self.browsers[name]
-        if browser["status"] == "selenium" and browser["driver"]:
+        if browser["status"] in ("selenium", "headless") and browser["driver"]:
+            if self.driver is browser["driver"]:
+                self.driver = None
             browser["driver"].quit()
+            self.discard_clone(browser["driver"])
         elif browser["status"] == "subprocess" and browser["process"]:
             browser["process"].terminate()
         browser["status"] = "idle"
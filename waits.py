@@ -0,0 +1,139 @@
+# Locator types and condition keys the in-page observer can evaluate
+OBSERVE_LOCATORS = {"css selector", "xpath", "id", "name", "class name", "tag name"}
+OBSERVE_KEYS = {"present", "visible", "value", "text_exact", "text_partial", "text_lower", "text_regex"}
+
+# Longest in-page observation between checks of a cancel flag, in seconds
+OBSERVE_SLICE = 1.0
+
+# Evaluates [[by, match, key, value], ...] on every DOM mutation (and input event) until
+# the specs are satisfied according to mode ("all" or "any") or the timeout elapses.
+# Resolves with {index, hits} where hits holds the element/true per spec, or null on timeout.
+OBSERVE_JS = """
+var specs = arguments[0], mode = arguments[1], timeout = arguments[2];
+var done = arguments[arguments.length - 1];
+
+function first(by, match) {
+    if (by === "xpath") {
+        var node = document.evaluate(match, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        return node && node.nodeType === 1 ? node : null;
+    }
+    if (by === "tag name") return document.getElementsByTagName(match)[0] || null;
+    var css = by === "id" ? '[id="' + CSS.escape(match) + '"]'
+        : by === "name" ? '[name="' + CSS.escape(match) + '"]'
+        : by === "class name" ? "." + CSS.escape(match)
+        : match;
+    return document.querySelector(css);
+}
+
+function visible(el) {
+    var style = window.getComputedStyle(el);
+    return style.visibility !== "hidden" && style.display !== "none"
+        && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+}
+
+function text(el) {
+    return el.innerText || el.textContent || "";
+}
+
+// Invalid selectors and patterns count as not (yet) satisfied rather than aborting the observer
+function check(spec) {
+    try {
+        var el = first(spec[0], spec[1]);
+        if (!el) return null;
+        var value = spec[3];
+        switch (spec[2]) {
+            case "present": return el;
+            case "visible": return visible(el) ? el : null;
+            case "value": return String(el.value || "").indexOf(value) !== -1 ? true : null;
+            case "text_exact": return text(el) === value ? true : null;
+            case "text_partial": return text(el).indexOf(value) !== -1 ? true : null;
+            case "text_lower": return text(el).toLowerCase().indexOf(String(value).toLowerCase()) !== -1 ? true : null;
+            case "text_regex": return new RegExp(value).test(text(el)) ? true : null;
+        }
+    } catch (e) {}
+    return null;
+}
+
+function evaluate() {
+    var hits = specs.map(check);
+    for (var i = 0; i < hits.length; i++) {
+        if (mode === "any" && hits[i] !== null) return {index: i, hits: hits};
+        if (mode === "all" && hits[i] === null) return null;
+    }
+    return mode === "all" ? {index: -1, hits: hits} : null;
+}
+
+var result = evaluate();
+if (result) {
+    done(result);
+    return;
+}
+
+var finished = false, observer, timer, sweep;
+function finish(r) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(sweep);
+    document.removeEventListener("input", onChange, true);
+    document.removeEventListener("change", onChange, true);
+    done(r);
+}
+function onChange() {
+    var r = evaluate();
+    if (r) finish(r);
+}
+
+observer = new MutationObserver(onChange);
+observer.observe(document.documentElement || document, {
+    subtree: true, childList: true, attributes: true, characterData: true
+});
+// Value edits and stylesheet driven visibility changes do not always mutate the DOM
+document.addEventListener("input", onChange, true);
+document.addEventListener("change", onChange, true);
+sweep = setInterval(onChange, 250);
+timer = setTimeout(function() { finish(null); }, timeout);
+"""
+
+
+# Declarative wait condition, evaluated in-page when possible and polled otherwise
+class Condition:
+    def __init__(self, by, match, condition="present", value=False, mode="partial"):
+        self.by = by
+        self.match = match
+        self.condition = condition
+        self.value = value
+        self.mode = mode
+
+    def __repr__(self):
+        return f"<Condition {self.key} by={self.by} match={self.match}>"
+
+    @property
+    def key(self):
+        return f"{self.condition}_{self.mode}" if self.condition == "text" else self.condition
+
+    @property
+    def observable(self):
+        return self.by in OBSERVE_LOCATORS and self.key in OBSERVE_KEYS
+
+    def spec(self):
+        return [self.by, self.match, self.key, self.value]
+
+
+class WaitCancelled(Exception):
+    pass
+
+
+# Drivers report a document torn down under a running async script as "document unloaded"
+def document_unloaded(error):
+    return "unloaded" in str(error).lower()
+
+
+#   Wraps a polling predicate so a set threading.Event aborts the WebDriverWait loop
+def cancellable(predicate, cancel):
+    def check(driver):
+        if cancel.is_set():
+            raise WaitCancelled("Wait cancelled")
+        return predicate(driver)
+    return check